@@ -1,4 +1,6 @@
 # Database connection
+# DB_BACKEND=sqlite runs against an embedded database (SQLITE_PATH) instead of Oracle
+DB_BACKEND=oracle
 DB_USERNAME=SYSTEM
 DB_PASSWORD=Zuhair2003
 DB_HOST=localhost
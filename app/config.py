@@ -8,20 +8,74 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 
 class Settings(BaseSettings):
     # Database settings
-    DB_HOST: str
-    DB_PORT: int
-    DB_SERVICE: str
-    DB_USER: str
-    DB_PASSWORD: str
+    DB_BACKEND: str = "oracle"  # oracle, sqlite
+    DB_HOST: Optional[str] = None
+    DB_PORT: Optional[int] = None
+    DB_SERVICE: Optional[str] = None
+    DB_USER: Optional[str] = None
+    DB_PASSWORD: Optional[str] = None
+    # Database file for DB_BACKEND=sqlite (":memory:" for a throwaway database)
+    SQLITE_PATH: str = os.path.join(BASE_DIR, "hr.db")
+    # Optional read-only replica (any SQLAlchemy URL) for reporting routes
+    DB_REPLICA_URL: Optional[str] = None
+    # Keep a session on the primary once it has written
+    DB_REPLICA_PIN_AFTER_WRITE: bool = True
+    # Optional override for the async engine URL; defaults to the backend's async driver
+    ASYNC_DATABASE_URL: Optional[str] = None
+    
+    # Connection pool settings
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_WARMUP: int = 5  # connections opened at startup, capped at DB_POOL_SIZE
+    DB_ECHO: bool = False
+    DB_STREAM_ARRAYSIZE: int = 1000  # rows fetched per round trip when streaming
+    
+    # Startup connectivity check, retried with exponential backoff
+    DB_CONNECT_RETRIES: int = 5
+    DB_CONNECT_BACKOFF: float = 1.0
+    DB_CONNECT_BACKOFF_MAX: float = 30.0
+    
+    # Per-request query counting; warn when one statement shape repeats
+    # more than this many times in a single request (likely N+1)
+    QUERY_METRICS_ENABLED: bool = True
+    QUERY_REPEAT_WARN_THRESHOLD: int = 10
+    # Per-route latency, status and size metrics, exposed on /metrics
+    REQUEST_METRICS_ENABLED: bool = True
     
     # Security settings
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
+    # WebSocket settings
+    WS_SEND_TIMEOUT: float = 5.0  # seconds before a send counts as failed
+    WS_QUEUE_SIZE: int = 100  # pending messages per connection
+    WS_OVERFLOW_POLICY: str = "drop_oldest"  # drop_oldest, coalesce, disconnect
+    # Cross-worker delivery: "inprocess" for a single worker, "redis" to
+    # fan out through a Redis-protocol server at WS_BROKER_URL
+    WS_BROKER: str = "inprocess"
+    WS_BROKER_URL: Optional[str] = None
+    WS_BROKER_CHANNEL_PREFIX: str = "hr:ws:"
+    WS_BATCH_WINDOW_MS: int = 100  # collect department updates this long; 0 sends immediately
+    WS_REPLAY_BUFFER_SIZE: int = 200  # recent frames kept per channel for reconnecting clients
+    WS_HEARTBEAT_INTERVAL: float = 25.0  # seconds between server pings
+    WS_HEARTBEAT_TIMEOUT: float = 60.0  # close sockets silent for this long
+    WS_MAX_CONNECTIONS_PER_USER: int = 5  # oldest sockets are closed beyond this
+    PRINCIPAL_CACHE_TTL: int = 300  # seconds before the user/department map is reloaded
+    
     # Application settings
     APP_NAME: str = "HR Management System"
     DEBUG: bool = True
+    # Compiled template bytecode; defaults to a per-user temp directory
+    TEMPLATE_CACHE_DIR: Optional[str] = None
+    TEMPLATE_STREAM_CHUNK_SIZE: int = 16384  # bytes buffered between flushes of a streamed page
+    # Rendered {% cache %} fragments; writes invalidate them, the TTL bounds
+    # staleness from writes made by other worker processes
+    FRAGMENT_CACHE_SIZE: int = 500
+    FRAGMENT_CACHE_TTL: int = 300
     
     class Config:
         env_file = os.path.join(BASE_DIR, ".env")
@@ -1,4 +1,6 @@
+from sqlalchemy import and_, case, func
 from sqlalchemy.orm import Session
+from typing import Dict, List, Optional
 from app import models, schemas
 from app.auth import get_password_hash
 
@@ -80,3 +82,127 @@ def create_notification(db: Session, note: schemas.NotificationBase):
 
 def get_notifications_for_employee(db: Session, emp_id: int):
     return db.query(models.Notification).filter(models.Notification.employeeID == emp_id).all()
+
+# ─── DASHBOARD DATA ────────────────────────────────────────────────
+# Plain dicts shared by the HTML dashboards and the /api/v1 endpoints
+def get_employee_for_user(db: Session, user_id: int) -> Optional[models.Employee]:
+    return db.query(models.Employee).filter(models.Employee.userID == user_id).first()
+
+def get_department_performance(db: Session) -> List[Dict]:
+    rows = db.query(
+        models.Department.name,
+        func.avg(models.PerformanceMetric.score).label("avg_score")
+    ).join(
+        models.Employee, models.Department.dept_id == models.Employee.department
+    ).join(
+        models.PerformanceMetric, models.Employee.employeeID == models.PerformanceMetric.employeeID
+    ).group_by(models.Department.name).all()
+    return [{"name": row.name, "avg_score": row.avg_score} for row in rows]
+
+def get_team_performance(db: Session, department_id: int, exclude_employee_id: Optional[int] = None) -> List[Dict]:
+    """
+    Task completion and on-time rates per department member, aggregated
+    in one grouped query rather than loading every member's tasks.
+    """
+    completed = models.Task.status == "completed"
+    on_time = and_(completed, models.Task.completed_date <= models.Task.due_date)
+    query = db.query(
+        models.Employee.employeeID,
+        models.Employee.firstName,
+        models.Employee.lastName,
+        func.count(models.Task.taskID).label("total_tasks"),
+        func.coalesce(func.sum(case((completed, 1), else_=0)), 0).label("completed_tasks"),
+        func.coalesce(func.sum(case((on_time, 1), else_=0)), 0).label("on_time_tasks")
+    ).outerjoin(
+        models.Task, models.Task.assigned_to == models.Employee.employeeID
+    ).filter(models.Employee.department == department_id)
+    if exclude_employee_id is not None:
+        query = query.filter(models.Employee.employeeID != exclude_employee_id)
+    rows = query.group_by(
+        models.Employee.employeeID, models.Employee.firstName, models.Employee.lastName
+    ).all()
+
+    team_performance = []
+    for row in rows:
+        if row.total_tasks > 0:
+            completion_rate = (row.completed_tasks / row.total_tasks) * 100
+            on_time_rate = (row.on_time_tasks / row.completed_tasks) * 100 if row.completed_tasks > 0 else 0
+            performance_score = (completion_rate * 0.7) + (on_time_rate * 0.3)
+        else:
+            performance_score = 0
+        team_performance.append({
+            "employee_id": row.employeeID,
+            "name": f"{row.firstName} {row.lastName}",
+            "performance_score": round(performance_score, 2),
+            "total_tasks": row.total_tasks,
+            "completed_tasks": row.completed_tasks,
+            "on_time_tasks": row.on_time_tasks
+        })
+    return team_performance
+
+def get_admin_dashboard(db: Session) -> Dict:
+    return {
+        "total_employees": db.query(models.Employee).count(),
+        "total_departments": db.query(models.Department).count(),
+        "total_jobs": db.query(models.Job).count(),
+        "total_trainings": db.query(models.LearningResource).count()
+    }
+
+def get_executive_dashboard(db: Session) -> Dict:
+    return {
+        "total_employees": db.query(models.Employee).count(),
+        "total_departments": db.query(models.Department).count(),
+        "total_trainings": db.query(models.LearningResource).count(),
+        "department_performance": get_department_performance(db)
+    }
+
+def get_manager_dashboard(db: Session, manager: models.Employee) -> Dict:
+    department = db.query(models.Department).filter(
+        models.Department.dept_id == manager.department
+    ).first()
+    active_tasks = db.query(models.Task).join(
+        models.Employee, models.Task.assigned_to == models.Employee.employeeID
+    ).filter(
+        models.Employee.department == manager.department,
+        models.Task.status != "completed"
+    ).count()
+    return {
+        "department_id": manager.department,
+        "department_name": department.name if department else None,
+        "total_employees": db.query(models.Employee).filter(
+            models.Employee.department == manager.department
+        ).count(),
+        "active_tasks": active_tasks,
+        "team_performance": get_team_performance(db, manager.department, manager.employeeID)
+    }
+
+def get_employee_dashboard(db: Session, employee: models.Employee) -> Dict:
+    department = db.query(models.Department.name).filter(
+        models.Department.dept_id == employee.department
+    ).scalar()
+    total_tasks, completed_tasks = db.query(
+        func.count(models.Task.taskID),
+        func.coalesce(func.sum(case((models.Task.status == "completed", 1), else_=0)), 0)
+    ).filter(models.Task.assigned_to == employee.employeeID).one()
+    unread = db.query(models.Notification).filter(
+        models.Notification.employeeID == employee.employeeID,
+        models.Notification.read_flag == "N"
+    ).count()
+    skills = db.query(
+        models.Skill.skill_id, models.Skill.name, models.EmployeeSkill.proficiency_level
+    ).join(
+        models.EmployeeSkill, models.EmployeeSkill.skillID == models.Skill.skill_id
+    ).filter(models.EmployeeSkill.employeeID == employee.employeeID).all()
+    return {
+        "employee_id": employee.employeeID,
+        "name": f"{employee.firstName} {employee.lastName}",
+        "position": employee.position,
+        "department_name": department,
+        "open_tasks": total_tasks - completed_tasks,
+        "completed_tasks": completed_tasks,
+        "unread_notifications": unread,
+        "skills": [
+            {"skill_id": row.skill_id, "name": row.name, "proficiency_level": row.proficiency_level}
+            for row in skills
+        ]
+    }
@@ -1,68 +1,260 @@
 from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import QueuePool
-import cx_Oracle
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.sql.elements import TextClause
 from fastapi import HTTPException
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+import asyncio
 import logging
+import threading
 from app.config import settings
+from app.utils.dialects import get_dialect
+from app.utils.query_metrics import install_query_listeners
+from app.utils.schema_cache import schema_cache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-try:
-    # Oracle connection settings from environment variables
-    dsn = cx_Oracle.makedsn(
-        settings.DB_HOST,
-        settings.DB_PORT,
-        service_name=settings.DB_SERVICE
-    )
-    DATABASE_URL = f"oracle+cx_oracle://{settings.DB_USER}:{settings.DB_PASSWORD}@{dsn}"
-
-    # Create engine with connection pooling
-    engine = create_engine(
-        DATABASE_URL,
-        poolclass=QueuePool,
-        pool_size=5,
-        max_overflow=10,
-        pool_timeout=30,
-        pool_recycle=1800,
-        echo=True
-    )
-
-    # Test the connection
+# Engines are created on first use, so importing this module (and every
+# route module that depends on it) never touches the database.
+Base = declarative_base()
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+AsyncSessionLocal = async_sessionmaker(
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+_engine: Optional[Engine] = None
+_read_engine: Optional[Engine] = None
+_async_engine: Optional[AsyncEngine] = None
+_engine_lock = threading.Lock()
+_database_ready = False
+
+# Backend-specific URLs, engine options and queries (see app/utils/dialects.py)
+dialect = get_dialect(settings)
+
+def get_engine() -> Engine:
+    """Return the primary engine, creating it on first call."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                try:
+                    _engine = create_engine(
+                        dialect.database_url(),
+                        echo=settings.DB_ECHO,
+                        **dialect.engine_options()
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to initialize database: {str(e)}")
+                    raise HTTPException(
+                        status_code=500,
+                        detail=f"Failed to initialize database connection. Please check your {dialect.name} installation and configuration."
+                    )
+                install_query_listeners(_engine)
+                SessionLocal.configure(bind=_engine)
+    return _engine
+
+def get_read_engine() -> Engine:
+    """
+    Return the read-only replica engine (DB_REPLICA_URL), creating it on
+    first call. Falls back to the primary when no replica is configured.
+    """
+    global _read_engine
+    if not settings.DB_REPLICA_URL:
+        return get_engine()
+    if _read_engine is None:
+        with _engine_lock:
+            if _read_engine is None:
+                replica_dialect = get_dialect(settings, make_url(settings.DB_REPLICA_URL).get_backend_name())
+                _read_engine = create_engine(
+                    settings.DB_REPLICA_URL,
+                    echo=settings.DB_ECHO,
+                    **replica_dialect.engine_options()
+                )
+                install_query_listeners(_read_engine)
+    return _read_engine
+
+def is_write_statement(clause) -> bool:
+    if clause is None:
+        return False
+    if isinstance(clause, TextClause):
+        return clause.text.lstrip().split(None, 1)[0].upper() in ("INSERT", "UPDATE", "DELETE", "MERGE")
+    return bool(getattr(clause, "is_dml", False))
+
+_read_from_primary: ContextVar[bool] = ContextVar("read_from_primary", default=False)
+
+@contextmanager
+def read_from_primary():
+    """
+    Route every read made inside the block to the primary, whatever
+    session it goes through. For results that outlive the request and
+    must not capture replica lag, such as cached fragments.
+    """
+    token = _read_from_primary.set(True)
     try:
-        with engine.connect() as connection:
-            # Use text() to create a proper SQLAlchemy text object
-            connection.execute(text("SELECT 1 FROM DUAL"))
+        yield
+    finally:
+        _read_from_primary.reset(token)
+
+class RoutingSession(Session):
+    """
+    Session that sends reads to the replica and writes to the primary.
+
+    Once the session flushes or executes a DML statement it is pinned to
+    the primary (DB_REPLICA_PIN_AFTER_WRITE), so a request that writes
+    and then reads sees its own changes despite replication lag. Reads
+    inside read_from_primary() also go to the primary.
+    """
+
+    pinned_to_primary = False
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._flushing or is_write_statement(clause):
+            if settings.DB_REPLICA_PIN_AFTER_WRITE:
+                self.pinned_to_primary = True
+            return get_engine()
+        if self.pinned_to_primary or _read_from_primary.get():
+            return get_engine()
+        return get_read_engine()
+
+ReadSessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False)
+
+def get_async_engine() -> AsyncEngine:
+    """Return the async engine, creating it on first call."""
+    global _async_engine
+    if _async_engine is None:
+        with _engine_lock:
+            if _async_engine is None:
+                if settings.ASYNC_DATABASE_URL:
+                    _async_engine = create_async_engine(
+                        settings.ASYNC_DATABASE_URL,
+                        echo=settings.DB_ECHO
+                    )
+                else:
+                    _async_engine = create_async_engine(
+                        dialect.async_database_url(),
+                        echo=settings.DB_ECHO,
+                        **dialect.async_engine_options()
+                    )
+                install_query_listeners(_async_engine.sync_engine)
+                AsyncSessionLocal.configure(bind=_async_engine)
+    return _async_engine
+
+def check_connection() -> None:
+    """Run a trivial query on the primary engine; raises on failure."""
+    with get_engine().connect() as connection:
+        # Use text() to create a proper SQLAlchemy text object
+        connection.execute(text(dialect.ping_query))
+
+def create_schema() -> None:
+    """
+    Create missing tables from the models on backends that manage their
+    own schema (the embedded SQLite stand-in). A no-op for Oracle.
+    """
+    if not dialect.creates_schema:
+        return
+    # Importing the models registers their tables on Base.metadata
+    from app import models  # noqa: F401
+    Base.metadata.create_all(bind=get_engine())
+    schema_cache.invalidate()
+
+def is_database_ready() -> bool:
+    return _database_ready
+
+def mark_database_ready(ready: bool) -> None:
+    global _database_ready
+    _database_ready = ready
+
+async def wait_for_database() -> bool:
+    """
+    Retry check_connection with exponential backoff until it succeeds or
+    DB_CONNECT_RETRIES attempts have failed. Runs the blocking check in a
+    worker thread so the event loop keeps serving while the database
+    comes up. Returns whether the database became reachable.
+    """
+    delay = settings.DB_CONNECT_BACKOFF
+    for attempt in range(1, settings.DB_CONNECT_RETRIES + 1):
+        try:
+            await asyncio.to_thread(check_connection)
+            await asyncio.to_thread(create_schema)
             logger.info("Successfully connected to the database")
-    except Exception as e:
-        logger.error(f"Failed to connect to database: {str(e)}")
+            mark_database_ready(True)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to connect to database (attempt {attempt}/{settings.DB_CONNECT_RETRIES}): {str(e)}")
+            if attempt < settings.DB_CONNECT_RETRIES:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, settings.DB_CONNECT_BACKOFF_MAX)
+    mark_database_ready(False)
+    return False
+
+async def dispose_engines() -> None:
+    global _engine, _read_engine, _async_engine
+    mark_database_ready(False)
+    if _read_engine is not None:
+        _read_engine.dispose()
+        _read_engine = None
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+    if _engine is not None:
+        _engine.dispose()
+        _engine = None
+
+def get_db():
+    get_engine()
+    db = SessionLocal()
+    try:
+        yield db
+    except SQLAlchemyError as e:
+        logger.error(f"Database error: {str(e)}")
         raise HTTPException(
             status_code=500,
-            detail="Database connection failed. Please check if Oracle is running and the service name is correct."
+            detail="Database operation failed"
         )
+    finally:
+        db.close()
 
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    Base = declarative_base()
+def get_read_db():
+    """
+    Session for read-mostly routes such as reports and dashboards. Reads
+    go to the replica when one is configured; see RoutingSession.
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    except SQLAlchemyError as e:
+        logger.error(f"Database error: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail="Database operation failed"
+        )
+    finally:
+        db.close()
+
+async def get_async_db():
+    """
+    Async counterpart of get_db.
 
-    def get_db():
-        db = SessionLocal()
+    Queries awaited on this session do not block the event loop, so
+    async route handlers can migrate to it one at a time.
+    """
+    get_async_engine()
+    async with AsyncSessionLocal() as db:
         try:
             yield db
-        except Exception as e:
+        except SQLAlchemyError as e:
+            await db.rollback()
             logger.error(f"Database error: {str(e)}")
             raise HTTPException(
                 status_code=500,
                 detail="Database operation failed"
             )
-        finally:
-            db.close()
-
-except Exception as e:
-    logger.error(f"Failed to initialize database: {str(e)}")
-    raise HTTPException(
-        status_code=500,
-        detail="Failed to initialize database connection. Please check your Oracle installation and configuration."
-    )
@@ -1,48 +1,88 @@
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
-from typing import Dict, List
+from fastapi.concurrency import run_in_threadpool
+from contextlib import asynccontextmanager
+from typing import Optional
+import asyncio
 import json
-from app.routes import auth, employee, admin, manager, executive
+import logging
+from app.config import settings
+from app.database import get_engine, wait_for_database, dispose_engines
+from app.routes import auth, employee, admin, manager, executive, monitoring, api
+from app.utils.pool_metrics import warm_pool
+from app.utils.principals import principal_cache, websocket_principal
+from app.utils.query_metrics import QueryMetricsMiddleware
+from app.utils.request_metrics import RequestMetricsMiddleware
+from app.utils.static_assets import static_assets
+from app.utils.templates import precompile_templates
+from app.utils.websocket_manager import websocket_manager
 
-app = FastAPI()
+logger = logging.getLogger(__name__)
 
-app.mount("/static", StaticFiles(directory="static"), name="static")
-templates = Jinja2Templates(directory="templates")
+async def connect_database():
+    if await wait_for_database():
+        # Open pooled connections before the first request needs them
+        await run_in_threadpool(warm_pool, get_engine(), settings.DB_POOL_WARMUP)
+        # Load the WebSocket principal map before clients reconnect
+        await principal_cache.preload()
 
-# WebSocket connection manager
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: Dict[str, List[WebSocket]] = {}
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Connect in the background so the server binds immediately;
+    # /health/ready reports when the database is reachable.
+    startup = asyncio.create_task(connect_database())
+    await run_in_threadpool(precompile_templates)
+    await run_in_threadpool(static_assets.build)
+    await websocket_manager.start()
+    yield
+    startup.cancel()
+    await websocket_manager.stop()
+    await dispose_engines()
 
-    async def connect(self, websocket: WebSocket, user_id: str):
-        await websocket.accept()
-        if user_id not in self.active_connections:
-            self.active_connections[user_id] = []
-        self.active_connections[user_id].append(websocket)
+app = FastAPI(lifespan=lifespan)
 
-    def disconnect(self, websocket: WebSocket, user_id: str):
-        if user_id in self.active_connections:
-            self.active_connections[user_id].remove(websocket)
-            if not self.active_connections[user_id]:
-                del self.active_connections[user_id]
+if settings.QUERY_METRICS_ENABLED:
+    app.add_middleware(QueryMetricsMiddleware)
 
-    async def send_notification(self, user_id: str, message: dict):
-        if user_id in self.active_connections:
-            for connection in self.active_connections[user_id]:
-                await connection.send_json(message)
+# Added last so it is outermost and times the whole request
+if settings.REQUEST_METRICS_ENABLED:
+    app.add_middleware(RequestMetricsMiddleware)
 
-manager = ConnectionManager()
+app.mount("/static", static_assets, name="static")
+
+def _parse_resume(resume: Optional[str]) -> Optional[dict]:
+    # A malformed resume token just means a fresh start
+    try:
+        state = json.loads(resume) if resume else None
+    except ValueError:
+        return None
+    return state if isinstance(state, dict) else None
 
 @app.websocket("/ws/{user_id}")
-async def websocket_endpoint(websocket: WebSocket, user_id: str):
-    await manager.connect(websocket, user_id)
+async def websocket_endpoint(websocket: WebSocket, user_id: str, resume: Optional[str] = None):
+    # Identify the client from its access_token cookie; the path must name
+    # the same user (by username or id)
+    try:
+        principal = await websocket_principal(websocket)
+    except Exception as e:
+        logger.error(f"WebSocket authentication failed: {str(e)}")
+        await websocket.close(code=1011)
+        return
+    if principal is None or user_id not in (principal.username, str(principal.user_id)):
+        await websocket.close(code=1008)
+        return
+
+    await websocket_manager.connect(websocket, principal.user_id, principal.department_id,
+                                    resume=_parse_resume(resume))
     try:
         while True:
-            data = await websocket.receive_text()
-            # Handle any incoming messages if needed
+            # Clients answer every ping, so silence past the timeout means
+            # the peer is gone even if TCP has not noticed
+            await asyncio.wait_for(websocket.receive_text(), timeout=settings.WS_HEARTBEAT_TIMEOUT)
+            websocket_manager.touch(websocket)
+    except asyncio.TimeoutError:
+        websocket_manager.reap(websocket)
     except WebSocketDisconnect:
-        manager.disconnect(websocket, user_id)
+        websocket_manager.disconnect(websocket)
 
 # Include routers
 app.include_router(auth.router)
@@ -50,3 +90,5 @@ app.include_router(employee.router)
 app.include_router(admin.router)
 app.include_router(manager.router)
 app.include_router(executive.router)
+app.include_router(monitoring.router)
+app.include_router(api.router)
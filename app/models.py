@@ -1,13 +1,10 @@
 from sqlalchemy import (
-    Column, Integer, String, Date, DateTime, ForeignKey, Text, CHAR, Boolean, Float
+    Column, Integer, String, Date, DateTime, ForeignKey, Text, CHAR, Boolean, Float, Index
 )
 from sqlalchemy.orm import relationship
-from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 from app.database import Base
 
-Base = declarative_base()
-
 
 class User(Base):
     __tablename__ = "USERS"
@@ -22,6 +19,7 @@ class User(Base):
     
     # Relationships
     employee = relationship("Employee", back_populates="user", uselist=False)
+    sessions = relationship("SessionStore", back_populates="user")
 
 
 class Department(Base):
@@ -55,8 +53,16 @@ class Employee(Base):
     department_rel = relationship("Department", back_populates="employees")
     skills = relationship("EmployeeSkill", back_populates="employee")
     courses = relationship("EmployeeCourse", back_populates="employee")
-    tasks = relationship("Task", back_populates="assigned_to_rel")
-    job = relationship("Job", back_populates="employees")
+    tasks = relationship("Task", foreign_keys="Task.assigned_to", back_populates="assigned_to_rel")
+    attendance_records = relationship("AttendanceRecord", back_populates="employee")
+    leave_requests = relationship("LeaveRequest", back_populates="employee")
+    performance_metrics = relationship("PerformanceMetric", back_populates="employee")
+    notifications = relationship("Notification", back_populates="employee")
+
+    __table_args__ = (
+        # Department team listings (team_overview, manage_team)
+        Index("IX_EMPLOYEES_DEPT_EMP", "DEPARTMENT", "EMPLOYEEID"),
+    )
 
 
 class AttendanceRecord(Base):
@@ -70,6 +76,10 @@ class AttendanceRecord(Base):
 
     employee = relationship("Employee", back_populates="attendance_records")
 
+    __table_args__ = (
+        Index("IX_ATTENDANCE_EMP_DATE", "EMPLOYEEID", "ATT_DATE"),
+    )
+
 
 class Task(Base):
     __tablename__ = "TASKS"
@@ -89,6 +99,12 @@ class Task(Base):
     assigned_to_rel = relationship("Employee", foreign_keys=[assigned_to], back_populates="tasks")
     assigned_by_rel = relationship("Employee", foreign_keys=[assigned_by])
 
+    __table_args__ = (
+        # Covers the per-assignee status/on-time aggregation without
+        # visiting the table
+        Index("IX_TASKS_ASSIGNEE_STATUS", "ASSIGNED_TO", "STATUS", "DUE_DATE", "COMPLETED_DATE"),
+    )
+
 
 class LeaveRequest(Base):
     __tablename__ = "LEAVE_REQUESTS"
@@ -102,6 +118,10 @@ class LeaveRequest(Base):
 
     employee = relationship("Employee", back_populates="leave_requests")
 
+    __table_args__ = (
+        Index("IX_LEAVE_EMP_DATES", "EMPLOYEEID", "START_DATE", "END_DATE"),
+    )
+
 
 class PerformanceMetric(Base):
     __tablename__ = "PERFORMANCE_METRIC"
@@ -124,6 +144,10 @@ class Notification(Base):
 
     employee = relationship("Employee", back_populates="notifications")
 
+    __table_args__ = (
+        Index("IX_NOTIFICATION_EMP_READ", "EMPLOYEEID", "READ_FLAG"),
+    )
+
 
 class SessionStore(Base):
     __tablename__ = "SESSION_STORE"
@@ -140,7 +164,7 @@ class EmployeeSkill(Base):
     __tablename__ = "employee_skills"
 
     id = Column(Integer, primary_key=True, index=True)
-    employeeID = Column(Integer, ForeignKey("employees.employeeID"))
+    employeeID = Column(Integer, ForeignKey("EMPLOYEES.EMPLOYEEID"))
     skillID = Column(Integer, ForeignKey("skills.skill_id"))
     proficiency_level = Column(Float)
     last_updated = Column(DateTime, default=datetime.utcnow)
@@ -165,7 +189,7 @@ class EmployeeCourse(Base):
     __tablename__ = "employee_courses"
 
     id = Column(Integer, primary_key=True, index=True)
-    employeeID = Column(Integer, ForeignKey("employees.employeeID"))
+    employeeID = Column(Integer, ForeignKey("EMPLOYEES.EMPLOYEEID"))
     courseID = Column(Integer, ForeignKey("learning_resources.id"))
     status = Column(String(20))  # pending, in_progress, completed
     progress = Column(Float, default=0)
@@ -187,7 +211,7 @@ class LearningResource(Base):
     type = Column(String(20))  # course, article, video, book
     duration = Column(Float)  # in hours
     rating = Column(Float)
-    dept_id = Column(Integer, ForeignKey("departments.dept_id"))
+    dept_id = Column(Integer, ForeignKey("DEPARTMENTS.DEPT_ID"))
     
     # Relationships
     department = relationship("Department", back_populates="learning_resources")
@@ -199,7 +223,7 @@ class CareerLevel(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(50))
-    dept_id = Column(Integer, ForeignKey("departments.dept_id"))
+    dept_id = Column(Integer, ForeignKey("DEPARTMENTS.DEPT_ID"))
     level_order = Column(Integer)
     description = Column(Text)
     
@@ -221,4 +245,3 @@ class Job(Base):
     
     # Relationships
     department = relationship("Department", back_populates="jobs")
-    employees = relationship("Employee", back_populates="job")
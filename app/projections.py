@@ -0,0 +1,72 @@
+# projections.py
+"""
+Read-only row projections for views that only display data.
+
+Each query selects just the columns a page shows and returns NamedTuple
+DTOs: no identity map entry, no change tracking and no lazy-loading
+relationship proxies for a template to trip over.
+"""
+from datetime import datetime
+from sqlalchemy import Select, func, select
+from sqlalchemy.orm import Session
+from typing import List, NamedTuple, Optional, Type
+from app import models
+
+def fetch_all(db: Session, dto: Type[NamedTuple], statement: Select) -> List:
+    """Run a Core select whose columns match dto's fields, in order."""
+    return [dto._make(row) for row in db.execute(statement)]
+
+def fetch_one(db: Session, dto: Type[NamedTuple], statement: Select):
+    row = db.execute(statement).first()
+    return dto._make(row) if row is not None else None
+
+# ─── Employees ─────────────────────────────────────────────────────
+class TeamMemberRow(NamedTuple):
+    employee_id: int
+    first_name: Optional[str]
+    last_name: Optional[str]
+    email: Optional[str]
+    position: Optional[str]
+    hire_date: Optional[datetime]
+
+    @property
+    def name(self) -> str:
+        return f"{self.first_name} {self.last_name}"
+
+def team_members(db: Session, department_id: int, exclude_employee_id: Optional[int] = None) -> List[TeamMemberRow]:
+    statement = select(
+        models.Employee.employeeID,
+        models.Employee.firstName,
+        models.Employee.lastName,
+        models.Employee.email,
+        models.Employee.position,
+        models.Employee.hire_date
+    ).where(models.Employee.department == department_id)
+    if exclude_employee_id is not None:
+        statement = statement.where(models.Employee.employeeID != exclude_employee_id)
+    return fetch_all(db, TeamMemberRow, statement.order_by(models.Employee.lastName, models.Employee.firstName))
+
+# ─── Departments ───────────────────────────────────────────────────
+class DepartmentRow(NamedTuple):
+    dept_id: int
+    name: Optional[str]
+    description: Optional[str]
+    employee_count: int
+
+def _department_select() -> Select:
+    return select(
+        models.Department.dept_id,
+        models.Department.name,
+        models.Department.description,
+        func.count(models.Employee.employeeID)
+    ).outerjoin(
+        models.Employee, models.Employee.department == models.Department.dept_id
+    ).group_by(
+        models.Department.dept_id, models.Department.name, models.Department.description
+    )
+
+def departments(db: Session) -> List[DepartmentRow]:
+    return fetch_all(db, DepartmentRow, _department_select().order_by(models.Department.name))
+
+def department(db: Session, dept_id: int) -> Optional[DepartmentRow]:
+    return fetch_one(db, DepartmentRow, _department_select().where(models.Department.dept_id == dept_id))
@@ -1,72 +1,139 @@
 # app/routes/admin.py
 from fastapi import APIRouter, Request, Depends, HTTPException
-from fastapi.templating import Jinja2Templates
-from fastapi.responses import RedirectResponse, JSONResponse, HTMLResponse
+from fastapi.responses import RedirectResponse, JSONResponse, HTMLResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from app.database import get_db
-from app.models import User, Employee, Department, Job, Training
+from app.database import ReadSessionLocal, get_read_db
+from app.models import User, Employee, Department, Job, LearningResource
+from app import projections
 from app.auth import get_current_active_user
 from app.utils.auth import verify_role
+from app.utils.db_operations import stream_csv, stream_query
+from app.utils.templates import StreamingTemplateResponse, templates
 from typing import List
 from datetime import datetime
 
 router = APIRouter(prefix="/admin")
-templates = Jinja2Templates(directory="templates")
 
 @router.get("/dashboard", response_class=HTMLResponse)
 async def admin_dashboard(
     request: Request,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     verify_role("admin", current_user.role)
     
-    # Get system statistics
-    total_employees = db.query(Employee).count()
-    total_departments = db.query(Department).count()
-    total_jobs = db.query(Job).count()
-    total_trainings = db.query(Training).count()
+    # System statistics are callables: the template only runs them when
+    # its cached stats fragment is missing or out of date
+    stats = {
+        "total_employees": lambda: db.query(Employee).count(),
+        "total_departments": lambda: db.query(Department).count(),
+        "total_jobs": lambda: db.query(Job).count(),
+        "total_trainings": lambda: db.query(LearningResource).count()
+    }
     
     return templates.TemplateResponse(
-        "admin/dashboard.html",
+        "admin-dashboard.html",
         {
             "request": request,
-            "total_employees": total_employees,
-            "total_departments": total_departments,
-            "total_jobs": total_jobs,
-            "total_trainings": total_trainings
+            "stats": stats
         }
     )
 
 @router.get("/employees", response_class=HTMLResponse)
 async def manage_employees(
     request: Request,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_active_user)
 ):
     verify_role("admin", current_user.role)
     
-    employees = db.query(Employee).all()
-    departments = db.query(Department).all()
+    # The page renders after the route returns, so it gets its own session;
+    # rows are fetched as the table is streamed out
+    page_db = ReadSessionLocal()
+    employees = stream_query(
+        page_db,
+        """
+        SELECT e.FIRST_NAME || ' ' || e.LAST_NAME AS "name", d.NAME AS "department",
+               e.EMAIL AS "email", e.POSITION AS "position"
+        FROM EMPLOYEES e
+        LEFT JOIN DEPARTMENTS d ON d.DEPT_ID = e.DEPARTMENT
+        ORDER BY e.LAST_NAME, e.FIRST_NAME
+        """
+    )
     
-    return templates.TemplateResponse(
-        "admin/employees.html",
+    return StreamingTemplateResponse(
+        "employee-list.html",
         {
             "request": request,
-            "employees": employees,
-            "departments": departments
-        }
+            "employees": employees
+        },
+        session=page_db
+    )
+
+@router.get("/user-management", response_class=HTMLResponse)
+async def manage_users(
+    request: Request,
+    current_user: User = Depends(get_current_active_user)
+):
+    verify_role("admin", current_user.role)
+    
+    page_db = ReadSessionLocal()
+    users = stream_query(
+        page_db,
+        """
+        SELECT USERID AS "id", USERNAME AS "username", ROLE AS "role", IS_ACTIVE AS "is_active"
+        FROM USERS
+        ORDER BY USERNAME
+        """
+    )
+    
+    return StreamingTemplateResponse(
+        "user-management.html",
+        {
+            "request": request,
+            "users": users
+        },
+        session=page_db
+    )
+
+@router.get("/employees/export")
+async def export_employees(
+    current_user: User = Depends(get_current_active_user)
+):
+    verify_role("admin", current_user.role)
+    
+    def rows():
+        # The export gets its own session because it outlives the request's
+        export_db = ReadSessionLocal()
+        try:
+            yield from stream_csv(
+                export_db,
+                """
+                SELECT e.EMPLOYEEID, e.FIRST_NAME, e.LAST_NAME, e.EMAIL,
+                       e.POSITION, d.NAME AS DEPARTMENT, e.HIRE_DATE
+                FROM EMPLOYEES e
+                LEFT JOIN DEPARTMENTS d ON d.DEPT_ID = e.DEPARTMENT
+                ORDER BY e.EMPLOYEEID
+                """
+            )
+        finally:
+            export_db.close()
+    
+    return StreamingResponse(
+        rows(),
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="employees.csv"'}
     )
 
 @router.get("/departments", response_class=HTMLResponse)
 async def manage_departments(
     request: Request,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     verify_role("admin", current_user.role)
     
-    departments = db.query(Department).all()
+    # Display-only rows with member counts, no ORM instances
+    departments = projections.departments(db)
     
     return templates.TemplateResponse(
         "admin/departments.html",
@@ -79,32 +146,40 @@ async def manage_departments(
 @router.get("/jobs", response_class=HTMLResponse)
 async def manage_jobs(
     request: Request,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_active_user)
 ):
     verify_role("admin", current_user.role)
     
-    jobs = db.query(Job).all()
-    departments = db.query(Department).all()
+    page_db = ReadSessionLocal()
+    jobs = stream_query(
+        page_db,
+        """
+        SELECT j.JOB_ID AS "job_id", j.TITLE AS "title", d.NAME AS "department",
+               j.MIN_SALARY AS "min_salary", j.MAX_SALARY AS "max_salary", j.STATUS AS "status"
+        FROM JOBS j
+        LEFT JOIN DEPARTMENTS d ON d.DEPT_ID = j.DEPARTMENT_ID
+        ORDER BY j.TITLE
+        """
+    )
     
-    return templates.TemplateResponse(
+    return StreamingTemplateResponse(
         "admin/jobs.html",
         {
             "request": request,
-            "jobs": jobs,
-            "departments": departments
-        }
+            "jobs": jobs
+        },
+        session=page_db
     )
 
 @router.get("/trainings", response_class=HTMLResponse)
 async def manage_trainings(
     request: Request,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     verify_role("admin", current_user.role)
     
-    trainings = db.query(Training).all()
+    trainings = db.query(LearningResource).all()
     
     return templates.TemplateResponse(
         "admin/trainings.html",
@@ -118,7 +193,7 @@ async def manage_trainings(
 async def view_reports(
     request: Request,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     verify_role("admin", current_user.role)
     
@@ -131,7 +206,7 @@ async def view_reports(
 async def system_settings(
     request: Request,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     verify_role("admin", current_user.role)
     
@@ -0,0 +1,66 @@
+# app/routes/api.py
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from app import crud
+from app.auth import get_current_active_user
+from app.database import get_read_db
+from app.models import User
+from app.schemas import (
+    AdminDashboardOut,
+    EmployeeDashboardOut,
+    ExecutiveDashboardOut,
+    ManagerDashboardOut
+)
+from app.utils.auth import verify_role
+from app.utils.serialization import json_response
+
+# JSON versions of the dashboards for internal tooling. Every endpoint
+# accepts ?fields=a,b,list.field to return only part of the payload.
+router = APIRouter(prefix="/api/v1")
+
+FIELDS = Query(None, description="Comma-separated fields to include, e.g. total_employees,team_performance.name")
+
+def _employee_for(db: Session, user: User):
+    employee = crud.get_employee_for_user(db, user.userID)
+    if not employee:
+        raise HTTPException(status_code=404, detail="Employee record not found")
+    return employee
+
+@router.get("/dashboards/admin")
+def admin_dashboard(
+    fields: Optional[str] = FIELDS,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_read_db)
+):
+    verify_role("admin", current_user.role)
+    return json_response(AdminDashboardOut, crud.get_admin_dashboard(db), fields)
+
+@router.get("/dashboards/executive")
+def executive_dashboard(
+    fields: Optional[str] = FIELDS,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_read_db)
+):
+    verify_role("executive", current_user.role)
+    return json_response(ExecutiveDashboardOut, crud.get_executive_dashboard(db), fields)
+
+@router.get("/dashboards/manager")
+def manager_dashboard(
+    fields: Optional[str] = FIELDS,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_read_db)
+):
+    verify_role("manager", current_user.role)
+    manager = _employee_for(db, current_user)
+    return json_response(ManagerDashboardOut, crud.get_manager_dashboard(db, manager), fields)
+
+@router.get("/dashboards/employee")
+def employee_dashboard(
+    fields: Optional[str] = FIELDS,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_read_db)
+):
+    verify_role("employee", current_user.role)
+    employee = _employee_for(db, current_user)
+    return json_response(EmployeeDashboardOut, crud.get_employee_dashboard(db, employee), fields)
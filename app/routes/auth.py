@@ -1,7 +1,6 @@
 # app/routes/auth.py
 from fastapi import APIRouter, Request, Form, Depends, HTTPException, status
 from fastapi.responses import RedirectResponse
-from fastapi.templating import Jinja2Templates
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from datetime import timedelta
@@ -16,9 +15,9 @@ from app.auth import (
 )
 from app.models import User
 from app.config import settings
+from app.utils.templates import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="templates")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 @router.get("/")
@@ -1,17 +1,16 @@
 # app/routes/employee.py
 from fastapi import APIRouter, Request, Depends, HTTPException
-from fastapi.templating import Jinja2Templates
 from fastapi.responses import RedirectResponse, JSONResponse, HTMLResponse
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models import User, Employee, Department, EmployeeSkill, LearningResource
 from app.auth import get_current_active_user
 from app.utils.auth import verify_role, get_employee_department
+from app.utils.templates import templates
 from typing import List
 from datetime import datetime
 
 router = APIRouter(prefix="/employee")
-templates = Jinja2Templates(directory="templates")
 
 @router.get("/dashboard", response_class=HTMLResponse)
 async def employee_dashboard(
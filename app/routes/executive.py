@@ -1,49 +1,41 @@
 # app/routes/executive.py
 from fastapi import APIRouter, Request, Depends, HTTPException
-from fastapi.templating import Jinja2Templates
 from fastapi.responses import RedirectResponse, JSONResponse, HTMLResponse
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from app.database import get_db
-from app.models import User, Employee, Department, Performance, Training
+from app.database import get_read_db
+from app.models import User, Employee, Department, PerformanceMetric, LearningResource
+from app import crud, projections
 from app.auth import get_current_active_user
 from app.utils.auth import verify_role
+from app.utils.templates import templates
 from typing import List
 from datetime import datetime
 
 router = APIRouter(prefix="/executive")
-templates = Jinja2Templates(directory="templates")
 
 @router.get("/dashboard", response_class=HTMLResponse)
 async def executive_dashboard(
     request: Request,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     verify_role("executive", current_user.role)
     
-    # Get company-wide statistics
-    total_employees = db.query(Employee).count()
-    total_departments = db.query(Department).count()
-    total_trainings = db.query(Training).count()
-    
-    # Get department-wise performance
-    department_performance = db.query(
-        Department.name,
-        db.func.avg(Performance.score).label('avg_score')
-    ).join(
-        Employee, Department.id == Employee.department_id
-    ).join(
-        Performance, Employee.id == Performance.employee_id
-    ).group_by(Department.name).all()
+    # Company-wide statistics and department-wise performance are
+    # callables, run only when the cached dashboard fragment is stale
+    stats = {
+        "total_employees": lambda: db.query(Employee).count(),
+        "total_departments": lambda: db.query(Department).count(),
+        "total_trainings": lambda: db.query(LearningResource).count(),
+        "department_performance": lambda: crud.get_department_performance(db)
+    }
     
     return templates.TemplateResponse(
-        "executive/dashboard.html",
+        "executive-dashboard.html",
         {
             "request": request,
-            "total_employees": total_employees,
-            "total_departments": total_departments,
-            "total_trainings": total_trainings,
-            "department_performance": department_performance
+            "stats": stats
         }
     )
 
@@ -51,11 +43,12 @@ async def executive_dashboard(
 async def view_departments(
     request: Request,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     verify_role("executive", current_user.role)
     
-    departments = db.query(Department).all()
+    # Display-only rows with member counts, no ORM instances
+    departments = projections.departments(db)
     
     return templates.TemplateResponse(
         "executive/departments.html",
@@ -69,15 +62,15 @@ async def view_departments(
 async def company_performance(
     request: Request,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     verify_role("executive", current_user.role)
     
     # Get overall company performance metrics
     performance_metrics = db.query(
-        db.func.avg(Performance.score).label('avg_score'),
-        db.func.min(Performance.score).label('min_score'),
-        db.func.max(Performance.score).label('max_score')
+        func.avg(PerformanceMetric.score).label('avg_score'),
+        func.min(PerformanceMetric.score).label('min_score'),
+        func.max(PerformanceMetric.score).label('max_score')
     ).first()
     
     return templates.TemplateResponse(
@@ -92,7 +85,7 @@ async def company_performance(
 async def company_reports(
     request: Request,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     verify_role("executive", current_user.role)
     
@@ -105,7 +98,7 @@ async def company_reports(
 async def company_strategy(
     request: Request,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     verify_role("executive", current_user.role)
     
@@ -1,24 +1,25 @@
 # app/routes/manager.py
 from fastapi import APIRouter, Request, Depends, HTTPException
-from fastapi.templating import Jinja2Templates
 from fastapi.responses import RedirectResponse, JSONResponse, HTMLResponse
+from sqlalchemy import distinct, func, text
 from sqlalchemy.orm import Session
-from app.database import get_db
-from app.utils import verify_token
-from app import models
-from app.main import manager
-from jose import JWTError
+from app.config import settings
+from app.database import get_db, get_read_db
+from app import crud, models, projections
+from app.schemas import TeamPerformanceOut
+from app.utils.serialization import json_response
+from app.utils.websocket_manager import websocket_manager
+from jose import JWTError, jwt
 from datetime import datetime
 import json
-from app.utils.auth import verify_role, get_department_employees
-from app.database import get_database
-from app.models import User, Employee, Department, Task, Performance
+from app.utils.auth import verify_role
+from app.models import (
+    User, Employee, Department, Task, PerformanceMetric, EmployeeSkill, EmployeeCourse
+)
 from app.auth import get_current_active_user
-from typing import List
-import databases
+from app.utils.templates import templates
 
 router = APIRouter(prefix="/manager")
-templates = Jinja2Templates(directory="templates")
 
 def get_current_user(request: Request):
     token = request.cookies.get("access_token")
@@ -27,7 +28,7 @@ def get_current_user(request: Request):
     try:
         if token.startswith("Bearer "):
             token = token[7:]
-        payload = verify_token(token)
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         return payload
     except JWTError:
         return None
@@ -36,34 +37,39 @@ def get_current_user(request: Request):
 async def manager_dashboard(
     request: Request,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     verify_role("manager", current_user.role)
     
-    # Get department statistics
+    # The manager's department is the one their employee record is in
+    manager = db.query(Employee).filter(Employee.userID == current_user.userID).first()
     department = db.query(Department).filter(
-        Department.manager_id == current_user.id
-    ).first()
+        Department.dept_id == manager.department
+    ).first() if manager else None
     
     if not department:
         raise HTTPException(status_code=404, detail="Department not found")
     
-    total_employees = db.query(Employee).filter(
-        Employee.department_id == department.id
-    ).count()
-    
-    active_tasks = db.query(Task).filter(
-        Task.department_id == department.id,
-        Task.status != "completed"
-    ).count()
+    # Department statistics are callables, run only when the cached
+    # fragment for this department is stale
+    stats = {
+        "total_employees": lambda: db.query(Employee).filter(
+            Employee.department == department.dept_id
+        ).count(),
+        "active_tasks": lambda: db.query(Task).join(
+            Employee, Task.assigned_to == Employee.employeeID
+        ).filter(
+            Employee.department == department.dept_id,
+            Task.status != "completed"
+        ).count()
+    }
     
     return templates.TemplateResponse(
-        "manager/dashboard.html",
+        "manager-dashboard.html",
         {
             "request": request,
             "department": department,
-            "total_employees": total_employees,
-            "active_tasks": active_tasks
+            "stats": stats
         }
     )
 
@@ -71,20 +77,19 @@ async def manager_dashboard(
 async def manage_team(
     request: Request,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     verify_role("manager", current_user.role)
     
-    department = db.query(Department).filter(
-        Department.manager_id == current_user.id
-    ).first()
+    # The manager's department is the one their employee record is in
+    manager = crud.get_employee_for_user(db, current_user.userID)
+    department = projections.department(db, manager.department) if manager else None
     
     if not department:
         raise HTTPException(status_code=404, detail="Department not found")
     
-    team_members = db.query(Employee).filter(
-        Employee.department_id == department.id
-    ).all()
+    # Display-only rows: just the columns the page shows, no ORM instances
+    team_members = projections.team_members(db, department.dept_id, manager.employeeID)
     
     return templates.TemplateResponse(
         "manager/team.html",
@@ -99,7 +104,7 @@ async def manage_team(
 async def manage_tasks(
     request: Request,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     verify_role("manager", current_user.role)
     
@@ -127,21 +132,23 @@ async def manage_tasks(
 async def team_performance(
     request: Request,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     verify_role("manager", current_user.role)
     
+    # The manager's department is the one their employee record is in
+    manager = db.query(Employee).filter(Employee.userID == current_user.userID).first()
     department = db.query(Department).filter(
-        Department.manager_id == current_user.id
-    ).first()
+        Department.dept_id == manager.department
+    ).first() if manager else None
     
     if not department:
         raise HTTPException(status_code=404, detail="Department not found")
     
-    performances = db.query(Performance).join(
-        Employee, Performance.employee_id == Employee.id
+    performances = db.query(PerformanceMetric).join(
+        Employee, PerformanceMetric.employeeID == Employee.employeeID
     ).filter(
-        Employee.department_id == department.id
+        Employee.department == department.dept_id
     ).all()
     
     return templates.TemplateResponse(
@@ -157,7 +164,7 @@ async def team_performance(
 async def department_reports(
     request: Request,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     verify_role("manager", current_user.role)
     
@@ -177,7 +184,7 @@ async def department_reports(
     )
 
 @router.get("/team-overview")
-def team_overview(request: Request, db: Session = Depends(get_db)):
+def team_overview(request: Request, db: Session = Depends(get_read_db)):
     user = get_current_user(request)
     if not user:
         return RedirectResponse("/", status_code=303)
@@ -247,7 +254,7 @@ def team_overview(request: Request, db: Session = Depends(get_db)):
     )
 
 @router.get("/team-performance-data")
-def get_team_performance_data(request: Request, db: Session = Depends(get_db)):
+def get_team_performance_data(request: Request, db: Session = Depends(get_read_db)):
     user = get_current_user(request)
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
@@ -259,42 +266,9 @@ def get_team_performance_data(request: Request, db: Session = Depends(get_db)):
     if not manager:
         raise HTTPException(status_code=404, detail="Manager not found")
     
-    # Get all employees in the manager's department
-    team_members = db.query(models.Employee).filter(
-        models.Employee.department == manager.department,
-        models.Employee.employeeID != manager.employeeID
-    ).all()
-    
-    # Calculate real-time team performance
-    team_performance = []
-    for member in team_members:
-        tasks = db.query(models.Task).filter(
-            models.Task.assigned_to == member.employeeID
-        ).all()
-        
-        total_tasks = len(tasks)
-        completed_tasks = len([t for t in tasks if t.status == "completed"])
-        on_time_tasks = len([t for t in tasks if t.status == "completed" and t.completed_date <= t.due_date])
-        
-        if total_tasks > 0:
-            completion_rate = (completed_tasks / total_tasks) * 100
-            on_time_rate = (on_time_tasks / completed_tasks) * 100 if completed_tasks > 0 else 0
-            performance_score = (completion_rate * 0.7) + (on_time_rate * 0.3)
-        else:
-            performance_score = 0
-        
-        team_performance.append({
-            "employee_id": member.employeeID,
-            "name": f"{member.firstName} {member.lastName}",
-            "performance_score": round(performance_score, 2),
-            "total_tasks": total_tasks,
-            "completed_tasks": completed_tasks,
-            "on_time_tasks": on_time_tasks
-        })
-    
-    return JSONResponse({
-        "team_performance": team_performance,
-        "timestamp": datetime.now().isoformat()
+    return json_response(TeamPerformanceOut, {
+        "team_performance": crud.get_team_performance(db, manager.department, manager.employeeID),
+        "timestamp": datetime.now()
     })
 
 @router.get("/task-assignment")
@@ -352,51 +326,36 @@ async def assign_task(
             "task_id": new_task.taskID,
             "timestamp": datetime.now().isoformat()
         }
-        await manager.send_notification(str(employee.userID), notification)
+        await websocket_manager.send_personal_message(notification, str(employee.userID))
     
     return JSONResponse(content={"status": "success", "task_id": new_task.taskID})
 
 @router.get("/team-development", response_class=HTMLResponse)
 async def team_development(
     request: Request,
-    current_user: User = Depends(get_current_user),
-    database: databases.Database = Depends(get_database)
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_read_db)
 ):
-    if not await verify_role(current_user.userID, "Manager", database):
-        raise HTTPException(status_code=403, detail="Access denied")
+    verify_role("manager", current_user.role)
     
     # Get manager's department
-    manager_query = """
-    SELECT department FROM EMPLOYEE WHERE employeeID = :employee_id
-    """
-    manager = await database.fetch_one(
-        query=manager_query,
-        values={"employee_id": current_user.userID}
-    )
+    manager = db.query(Employee).filter(Employee.userID == current_user.userID).first()
+    if not manager:
+        raise HTTPException(status_code=404, detail="Manager not found")
     
     # Get team members
-    team_members = await get_department_employees(manager["department"], database)
+    team_members = db.query(Employee).filter(Employee.department == manager.department).all()
     
     # Get team skills and progress
     team_skills = []
     for member in team_members:
-        skills_query = """
-        SELECT * FROM EMPLOYEE_SKILLS 
-        WHERE employeeID = :employee_id
-        """
-        skills = await database.fetch_all(
-            query=skills_query,
-            values={"employee_id": member["employeeID"]}
-        )
+        skills = db.query(EmployeeSkill).filter(
+            EmployeeSkill.employeeID == member.employeeID
+        ).all()
         
-        courses_query = """
-        SELECT * FROM EMPLOYEE_COURSES 
-        WHERE employeeID = :employee_id
-        """
-        courses = await database.fetch_all(
-            query=courses_query,
-            values={"employee_id": member["employeeID"]}
-        )
+        courses = db.query(EmployeeCourse).filter(
+            EmployeeCourse.employeeID == member.employeeID
+        ).all()
         
         team_skills.append({
             "employee": member,
@@ -415,14 +374,13 @@ async def team_development(
 @router.post("/assign-development-plan")
 async def assign_development_plan(
     plan_data: dict,
-    current_user: User = Depends(get_current_user),
-    database: databases.Database = Depends(get_database)
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
 ):
-    if not await verify_role(current_user.userID, "Manager", database):
-        raise HTTPException(status_code=403, detail="Access denied")
+    verify_role("manager", current_user.role)
     
-    # Insert development plan
-    insert_query = """
+    # DEVELOPMENT_PLAN has no ORM model, so the insert stays SQL
+    insert_query = text("""
     INSERT INTO DEVELOPMENT_PLAN (
         employeeID, title, description, status, 
         progress, target_date, assigned_by
@@ -430,10 +388,10 @@ async def assign_development_plan(
         :employee_id, :title, :description, 'in_progress',
         0, :target_date, :assigned_by
     )
-    """
-    await database.execute(
-        query=insert_query,
-        values={
+    """)
+    db.execute(
+        insert_query,
+        {
             "employee_id": plan_data["employee_id"],
             "title": plan_data["title"],
             "description": plan_data["description"],
@@ -441,46 +399,41 @@ async def assign_development_plan(
             "assigned_by": current_user.userID
         }
     )
+    db.commit()
     
     return {"status": "success"}
 
 @router.get("/team-performance", response_class=HTMLResponse)
-async def team_performance(
+async def team_skill_performance(
     request: Request,
-    current_user: User = Depends(get_current_user),
-    database: databases.Database = Depends(get_database)
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_read_db)
 ):
-    if not await verify_role(current_user.userID, "Manager", database):
-        raise HTTPException(status_code=403, detail="Access denied")
+    verify_role("manager", current_user.role)
     
     # Get manager's department
-    manager_query = """
-    SELECT department FROM EMPLOYEE WHERE employeeID = :employee_id
-    """
-    manager = await database.fetch_one(
-        query=manager_query,
-        values={"employee_id": current_user.userID}
-    )
+    manager = db.query(Employee).filter(Employee.userID == current_user.userID).first()
+    if not manager:
+        raise HTTPException(status_code=404, detail="Manager not found")
     
     # Get team performance metrics
-    performance_query = """
-    SELECT 
-        e.employeeID,
-        e.fullName,
-        COUNT(DISTINCT es.skillID) as total_skills,
-        AVG(es.proficiency_level) as avg_proficiency,
-        COUNT(DISTINCT ec.courseID) as total_courses,
-        AVG(ec.progress) as avg_course_progress
-    FROM EMPLOYEE e
-    LEFT JOIN EMPLOYEE_SKILLS es ON e.employeeID = es.employeeID
-    LEFT JOIN EMPLOYEE_COURSES ec ON e.employeeID = ec.employeeID
-    WHERE e.department = :department_id
-    GROUP BY e.employeeID, e.fullName
-    """
-    team_performance = await database.fetch_all(
-        query=performance_query,
-        values={"department_id": manager["department"]}
-    )
+    team_performance = db.query(
+        Employee.employeeID,
+        Employee.firstName,
+        Employee.lastName,
+        func.count(distinct(EmployeeSkill.skillID)).label("total_skills"),
+        func.avg(EmployeeSkill.proficiency_level).label("avg_proficiency"),
+        func.count(distinct(EmployeeCourse.courseID)).label("total_courses"),
+        func.avg(EmployeeCourse.progress).label("avg_course_progress")
+    ).outerjoin(
+        EmployeeSkill, EmployeeSkill.employeeID == Employee.employeeID
+    ).outerjoin(
+        EmployeeCourse, EmployeeCourse.employeeID == Employee.employeeID
+    ).filter(
+        Employee.department == manager.department
+    ).group_by(
+        Employee.employeeID, Employee.firstName, Employee.lastName
+    ).all()
     
     return templates.TemplateResponse(
         "team-performance.html",
@@ -0,0 +1,115 @@
+# app/routes/monitoring.py
+from fastapi import APIRouter, Depends, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from prometheus_client import CONTENT_TYPE_LATEST
+from app import database
+from app.auth import get_current_active_user
+from app.config import settings
+from app.database import (
+    get_engine,
+    get_read_engine,
+    check_connection,
+    is_database_ready,
+    mark_database_ready
+)
+from app.models import User
+from app.utils.auth import verify_role
+from app.utils.fragment_cache import fragment_cache
+from app.utils.pool_metrics import pool_status
+from app.utils.request_metrics import CallbackCollector, registry, render_metrics
+from app.utils.websocket_manager import websocket_manager
+
+router = APIRouter()
+
+@router.get("/health/live")
+async def liveness():
+    return {"status": "ok"}
+
+@router.get("/health/ready")
+async def readiness():
+    # Not ready until the startup connectivity check has succeeded
+    if not is_database_ready():
+        return JSONResponse(status_code=503, content={"status": "starting"})
+    try:
+        await run_in_threadpool(check_connection)
+    except Exception:
+        mark_database_ready(False)
+        return JSONResponse(status_code=503, content={"status": "database unavailable"})
+    return {"status": "ready"}
+
+def _pools():
+    pools = {"primary": pool_status(get_engine())}
+    if settings.DB_REPLICA_URL:
+        pools["replica"] = pool_status(get_read_engine())
+    # Only once some route has used it; a scrape must not build the engine
+    if database._async_engine is not None:
+        pools["async"] = pool_status(database._async_engine.sync_engine)
+    return pools
+
+@router.get("/metrics/pool")
+async def pool_metrics():
+    pools = _pools()
+    return {
+        "primary": pools["primary"],
+        "replica": pools.get("replica"),
+        "async": pools.get("async")
+    }
+
+# Pool fields exported to Prometheus: status key -> (metric, help, type, scale)
+POOL_METRICS = {
+    "size": ("db_pool_size", "Configured pool size", "gauge", 1),
+    "in_use": ("db_pool_checked_out", "Connections checked out of the pool", "gauge", 1),
+    "checked_in": ("db_pool_checked_in", "Idle connections in the pool", "gauge", 1),
+    "overflow": ("db_pool_overflow", "Overflow connections open", "gauge", 1),
+    "checkouts": ("db_pool_checkouts_total", "Connection checkouts", "counter", 1),
+    "checkout_failures": ("db_pool_checkout_failures_total", "Checkouts that timed out or failed", "counter", 1),
+    "checkout_wait_total_ms": ("db_pool_checkout_wait_seconds_total", "Time spent waiting for connections", "counter", 0.001),
+    "checkout_wait_max_ms": ("db_pool_checkout_wait_max_seconds", "Longest wait for a connection", "gauge", 0.001),
+}
+
+def _pool_samples():
+    samples = {}
+    for pool_name, status in _pools().items():
+        for key, (metric, documentation, kind, scale) in POOL_METRICS.items():
+            if key in status:
+                entry = samples.setdefault(metric, (documentation, kind, {}))
+                entry[2][(pool_name,)] = status[key] * scale
+    return samples
+
+def _websocket_samples():
+    stats = websocket_manager.connection_stats()
+    queued = sum(queue.stats()["depth"] for queue in websocket_manager.outbound.values())
+    return {
+        "websocket_connections": ("Open WebSocket connections on this worker", "gauge", {(): stats["live"]}),
+        "websocket_users": ("Users with at least one open WebSocket", "gauge", {(): stats["users"]}),
+        "websocket_queued_messages": ("Messages waiting in outbound queues", "gauge", {(): queued}),
+        "websocket_reaped_total": ("Sockets closed for missing heartbeats", "counter", {(): stats["reaped"]}),
+        "websocket_evicted_total": ("Sockets closed by the per-user connection cap", "counter", {(): stats["evicted"]}),
+    }
+
+registry.register(CallbackCollector(("pool",), _pool_samples))
+registry.register(CallbackCollector((), _websocket_samples))
+
+@router.get("/metrics")
+async def prometheus_metrics():
+    # Pool snapshots take locks and may build engines; keep them off the loop
+    return Response(await run_in_threadpool(render_metrics), media_type=CONTENT_TYPE_LATEST)
+
+@router.get("/metrics/websockets")
+async def websocket_metrics(current_user: User = Depends(get_current_active_user)):
+    # Lists who is connected and from which department; admins only.
+    # Anonymous aggregates are on /metrics
+    verify_role("admin", current_user.role)
+    connections = websocket_manager.queue_stats()
+    return {
+        **websocket_manager.connection_stats(),
+        "queued_messages": sum(entry["depth"] for entry in connections),
+        "batching": websocket_manager.batcher.stats(),
+        "replay": websocket_manager.replay.stats(),
+        "queues": connections
+    }
+
+@router.get("/metrics/fragment-cache")
+async def fragment_cache_metrics():
+    return fragment_cache.stats()
@@ -1,6 +1,7 @@
 # schemas.py
-from pydantic import BaseModel
-from typing import Optional
+from functools import lru_cache
+from pydantic import BaseModel, TypeAdapter
+from typing import Any, List, Optional
 from datetime import date, datetime
 
 # ─── User & Employee ───────────────────────────────────────────
@@ -111,3 +112,62 @@ class SessionStoreOut(BaseModel):
 class Token(BaseModel):
     access_token: str
     token_type: str
+
+# ─── Dashboard API (v1) ─────────────────────────────────────────
+class AdminDashboardOut(BaseModel):
+    total_employees: int
+    total_departments: int
+    total_jobs: int
+    total_trainings: int
+
+class DepartmentPerformanceOut(BaseModel):
+    name: str
+    avg_score: Optional[float]
+
+class ExecutiveDashboardOut(BaseModel):
+    total_employees: int
+    total_departments: int
+    total_trainings: int
+    department_performance: List[DepartmentPerformanceOut]
+
+class TeamMemberPerformanceOut(BaseModel):
+    employee_id: int
+    name: str
+    performance_score: float
+    total_tasks: int
+    completed_tasks: int
+    on_time_tasks: int
+
+class TeamPerformanceOut(BaseModel):
+    team_performance: List[TeamMemberPerformanceOut]
+    timestamp: datetime
+
+class ManagerDashboardOut(BaseModel):
+    department_id: int
+    department_name: Optional[str]
+    total_employees: int
+    active_tasks: int
+    team_performance: List[TeamMemberPerformanceOut]
+
+class SkillProgressOut(BaseModel):
+    skill_id: int
+    name: Optional[str]
+    proficiency_level: Optional[float]
+
+class EmployeeDashboardOut(BaseModel):
+    employee_id: int
+    name: str
+    position: Optional[str]
+    department_name: Optional[str]
+    open_tasks: int
+    completed_tasks: int
+    unread_notifications: int
+    skills: List[SkillProgressOut]
+
+@lru_cache(maxsize=None)
+def type_adapter(tp: Any) -> TypeAdapter:
+    """
+    TypeAdapter for a response type, built once. Constructing one compiles
+    a validator and serializer, so doing it per request is wasted work.
+    """
+    return TypeAdapter(tp)
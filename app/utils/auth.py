@@ -12,10 +12,13 @@ def verify_role(required_role: str, current_user_role: str):
         required_role (str): The role required to access the resource
         current_user_role (str): The role of the current user
         
+    Roles are compared case-insensitively: routes name them in lower
+    case while USERS.ROLE stores "Admin", "Manager" and so on.
+        
     Raises:
         HTTPException: If the user doesn't have the required role
     """
-    if current_user_role != required_role:
+    if (current_user_role or "").lower() != required_role.lower():
         raise HTTPException(
             status_code=403,
             detail=f"Access denied. Required role: {required_role}"
@@ -0,0 +1,111 @@
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, List, Optional
+import asyncio
+import logging
+from app.config import settings
+from app.utils.serialization import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+# Called with (channel, message) for every message published on any worker
+Listener = Callable[[str, dict], Awaitable[None]]
+
+class Broker(ABC):
+    """
+    Carries WebSocket messages between worker processes. Publishers send
+    to a channel such as "user:42" or "department:7"; every worker's
+    listeners receive the message and deliver it to their own sockets.
+    """
+
+    def __init__(self):
+        self._listeners: List[Listener] = []
+
+    def subscribe(self, listener: Listener):
+        self._listeners.append(listener)
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    @abstractmethod
+    async def publish(self, channel: str, message: dict):
+        ...
+
+    async def _dispatch(self, channel: str, message: dict):
+        for listener in self._listeners:
+            try:
+                await listener(channel, message)
+            except Exception as e:
+                logger.error(f"Error delivering message on channel {channel}: {str(e)}")
+
+class InProcessBroker(Broker):
+    """
+    Delivers straight to this process's listeners. Correct for a single
+    worker and used as the stand-in in tests.
+    """
+
+    async def publish(self, channel: str, message: dict):
+        await self._dispatch(channel, message)
+
+class RedisBroker(Broker):
+    """
+    Pub/sub over any Redis-protocol server (Redis, Valkey, KeyDB). Each
+    worker pattern-subscribes to the channel prefix, so a message
+    published by one worker reaches sockets held by all of them.
+    Requires the optional `redis` package.
+    """
+
+    def __init__(self, url: str, prefix: str):
+        super().__init__()
+        self.url = url
+        self.prefix = prefix
+        self._client = None
+        self._reader: Optional[asyncio.Task] = None
+
+    async def start(self):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("WS_BROKER=redis requires the 'redis' package (pip install redis)")
+        self._client = redis.from_url(self.url)
+        self._reader = asyncio.create_task(self._read())
+
+    async def stop(self):
+        if self._reader is not None:
+            self._reader.cancel()
+            self._reader = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _read(self):
+        # Resubscribe after connection errors so a Redis restart does not
+        # silently stop delivery on this worker
+        while True:
+            try:
+                async with self._client.pubsub() as pubsub:
+                    await pubsub.psubscribe(f"{self.prefix}*")
+                    async for item in pubsub.listen():
+                        if item["type"] != "pmessage":
+                            continue
+                        channel = item["channel"].decode()[len(self.prefix):]
+                        await self._dispatch(channel, loads(item["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"WebSocket broker subscription failed, retrying: {str(e)}")
+                await asyncio.sleep(1)
+
+    async def publish(self, channel: str, message: dict):
+        await self._client.publish(f"{self.prefix}{channel}", dumps(message))
+
+def create_broker() -> Broker:
+    if settings.WS_BROKER == "redis":
+        if not settings.WS_BROKER_URL:
+            raise ValueError("WS_BROKER=redis requires WS_BROKER_URL")
+        return RedisBroker(settings.WS_BROKER_URL, settings.WS_BROKER_CHANNEL_PREFIX)
+    if settings.WS_BROKER == "inprocess":
+        return InProcessBroker()
+    raise ValueError(f"Unsupported WS_BROKER '{settings.WS_BROKER}'. Expected one of: inprocess, redis")
@@ -1,8 +1,14 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import text
-from typing import List, Dict, Any, Optional
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from typing import List, Dict, Any, Iterator, Optional
+import csv
+import io
 import logging
+from app.config import settings
 from app.utils.error_handlers import handle_database_operation, DatabaseError
+from app.utils.schema_cache import schema_cache
 
 logger = logging.getLogger(__name__)
 
@@ -10,11 +16,78 @@ logger = logging.getLogger(__name__)
 async def execute_query(db: Session, query: str, params: Optional[Dict] = None) -> List[Dict]:
     try:
         result = db.execute(text(query), params or {})
-        return [dict(row) for row in result]
+        return [dict(row._mapping) for row in result]
     except Exception as e:
         logger.error(f"Query execution failed: {str(e)}")
         raise DatabaseError(str(e))
 
+# yield_per only sizes SQLAlchemy's row buffer; the Oracle drivers take
+# cursor.arraysize (rows per network round trip) from the engine-wide
+# `arraysize` argument alone. Statements carrying an "arraysize"
+# execution option get it set on their own cursor instead.
+@event.listens_for(Engine, "before_cursor_execute")
+def _apply_arraysize(conn, cursor, statement, parameters, context, executemany):
+    arraysize = context.execution_options.get("arraysize") if context is not None else None
+    if arraysize:
+        cursor.arraysize = arraysize
+
+def _streaming(query: str, arraysize: int):
+    return text(query).execution_options(stream_results=True, yield_per=arraysize, arraysize=arraysize)
+
+def stream_query(db: Session, query: str, params: Optional[Dict] = None,
+                 arraysize: Optional[int] = None, chunk_size: Optional[int] = None,
+                 named: bool = True) -> Iterator:
+    """
+    Iterate a query's result from a server-side cursor instead of building
+    a list, so memory stays flat regardless of result size.
+
+    The driver fetches `arraysize` rows per round trip (DB_STREAM_ARRAYSIZE
+    by default) and SQLAlchemy buffers the same number at a time.
+    Yields SQLAlchemy Row objects (named tuples) or plain tuples when
+    named=False; with chunk_size, yields lists of that many rows instead.
+    Plain generator, so it can be passed to StreamingResponse directly.
+    """
+    arraysize = arraysize or settings.DB_STREAM_ARRAYSIZE
+    statement = _streaming(query, arraysize)
+    try:
+        result = db.execute(statement, params or {})
+    except SQLAlchemyError as e:
+        logger.error(f"Streaming query failed: {str(e)}")
+        raise DatabaseError(str(e))
+    try:
+        if chunk_size:
+            for chunk in result.partitions(chunk_size):
+                yield chunk if named else [tuple(row) for row in chunk]
+        else:
+            for row in result:
+                yield row if named else tuple(row)
+    finally:
+        result.close()
+
+def stream_csv(db: Session, query: str, params: Optional[Dict] = None,
+               arraysize: Optional[int] = None, chunk_size: int = 1000) -> Iterator[str]:
+    """Stream a query as CSV text: the header row, then one piece per chunk of rows."""
+    arraysize = arraysize or settings.DB_STREAM_ARRAYSIZE
+    statement = _streaming(query, arraysize)
+    try:
+        result = db.execute(statement, params or {})
+    except SQLAlchemyError as e:
+        logger.error(f"Streaming query failed: {str(e)}")
+        raise DatabaseError(str(e))
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    try:
+        writer.writerow(result.keys())
+        for chunk in result.partitions(chunk_size):
+            writer.writerows(chunk)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+    finally:
+        result.close()
+
 @handle_database_operation
 async def execute_update(db: Session, query: str, params: Optional[Dict] = None) -> int:
     try:
@@ -48,54 +121,143 @@ async def execute_delete(db: Session, query: str, params: Optional[Dict] = None)
         logger.error(f"Delete execution failed: {str(e)}")
         raise DatabaseError(str(e))
 
+class _Batch:
+    """Consecutive operations sharing one statement, sent as a single executemany."""
+
+    def __init__(self, query: str, operation_type: str, optional: bool):
+        self.query = query
+        self.operation_type = operation_type
+        self.optional = optional
+        self.params: List[Dict] = []
+
+class UnitOfWork:
+    """
+    Runs a sequence of statements in one transaction with a single commit.
+
+    Consecutive operations with the same statement and type are grouped
+    and sent as one executemany call (array binds on Oracle), so 1,000
+    inserts cost one round trip instead of 1,000 commits. Operations
+    added with optional=True run inside a savepoint: if they fail, only
+    that batch is rolled back and the rest of the unit still commits.
+    Any other failure rolls back everything.
+
+    Usage:
+        with UnitOfWork(db) as uow:
+            for row in rows:
+                uow.add("INSERT INTO ...", row, operation_type='insert')
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._batches: List[_Batch] = []
+
+    def add(self, query: str, params: Optional[Dict] = None,
+            operation_type: str = 'update', optional: bool = False) -> "UnitOfWork":
+        last = self._batches[-1] if self._batches else None
+        # 'query' operations return rows, so they are never merged
+        if (last is not None and operation_type != 'query'
+                and last.query == query
+                and last.operation_type == operation_type
+                and last.optional == optional):
+            last.params.append(params or {})
+        else:
+            batch = _Batch(query, operation_type, optional)
+            batch.params.append(params or {})
+            self._batches.append(batch)
+        return self
+
+    def _execute_batch(self, batch: _Batch):
+        statement = text(batch.query)
+        if batch.operation_type == 'query':
+            result = self.db.execute(statement, batch.params[0])
+            return [dict(row._mapping) for row in result]
+        if len(batch.params) == 1:
+            result = self.db.execute(statement, batch.params[0])
+        else:
+            result = self.db.execute(statement, batch.params)
+        return result.rowcount
+
+    def _run_batch(self, batch: _Batch):
+        if not batch.optional:
+            return self._execute_batch(batch)
+        savepoint = self.db.begin_nested()
+        try:
+            result = self._execute_batch(batch)
+            savepoint.commit()
+            return result
+        except SQLAlchemyError as e:
+            savepoint.rollback()
+            logger.warning(f"Optional operation rolled back to savepoint: {str(e)}")
+            return None
+
+    def execute(self) -> List[Any]:
+        """
+        Run every pending batch and commit once. Returns one result per
+        batch: a row list for queries, an affected row count for writes,
+        or None for an optional batch that was rolled back.
+        """
+        results = []
+        try:
+            for batch in self._batches:
+                results.append(self._run_batch(batch))
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        finally:
+            self._batches = []
+        return results
+
+    def __enter__(self) -> "UnitOfWork":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.execute()
+        else:
+            self._batches = []
+            self.db.rollback()
+        return False
+
 @handle_database_operation
 async def execute_transaction(db: Session, operations: List[Dict[str, Any]]) -> bool:
+    """
+    Run operations atomically with a single commit. Each operation is a
+    dict with 'query', optional 'params', 'type' (query, update, insert,
+    delete) and 'optional' (run in a savepoint; failure does not abort
+    the transaction).
+    """
     try:
+        unit = UnitOfWork(db)
         for operation in operations:
-            query = operation.get('query')
-            params = operation.get('params', {})
-            operation_type = operation.get('type', 'query')
-            
-            if operation_type == 'query':
-                await execute_query(db, query, params)
-            elif operation_type == 'update':
-                await execute_update(db, query, params)
-            elif operation_type == 'insert':
-                await execute_insert(db, query, params)
-            elif operation_type == 'delete':
-                await execute_delete(db, query, params)
-        
-        db.commit()
+            unit.add(
+                operation.get('query'),
+                operation.get('params', {}),
+                operation_type=operation.get('type', 'query'),
+                optional=operation.get('optional', False)
+            )
+        unit.execute()
         return True
     except Exception as e:
-        db.rollback()
         logger.error(f"Transaction failed: {str(e)}")
         raise DatabaseError(str(e))
 
 @handle_database_operation
 async def check_table_exists(db: Session, table_name: str) -> bool:
     try:
-        query = """
-        SELECT COUNT(*) 
-        FROM USER_TABLES 
-        WHERE TABLE_NAME = :table_name
-        """
-        result = await execute_query(db, query, {'table_name': table_name.upper()})
-        return result[0]['COUNT(*)'] > 0
+        return schema_cache.table_exists(db.get_bind(), table_name)
     except Exception as e:
         logger.error(f"Table existence check failed: {str(e)}")
         raise DatabaseError(str(e))
 
 @handle_database_operation
 async def get_table_columns(db: Session, table_name: str) -> List[Dict]:
+    """
+    Columns of a table from the schema cache: column_name, data_type,
+    data_length, nullable ('Y'/'N') and the reflected SQLAlchemy type.
+    """
     try:
-        query = """
-        SELECT column_name, data_type, data_length, nullable
-        FROM USER_TAB_COLUMNS
-        WHERE table_name = :table_name
-        ORDER BY column_id
-        """
-        return await execute_query(db, query, {'table_name': table_name.upper()})
+        return schema_cache.get_columns(db.get_bind(), table_name)
     except Exception as e:
         logger.error(f"Column retrieval failed: {str(e)}")
-        raise DatabaseError(str(e)) 
\ No newline at end of file
+        raise DatabaseError(str(e))
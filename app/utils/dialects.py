@@ -0,0 +1,162 @@
+from abc import ABC, abstractmethod
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.pool import StaticPool
+from typing import Dict, Any, List, Optional
+import uuid
+from app.utils.pool_metrics import TimedQueuePool, TimedAsyncAdaptedQueuePool
+
+class DatabaseDialect(ABC):
+    """
+    Everything that differs between database backends: connection URLs,
+    engine options, the connectivity probe and identifier case.
+    Schema introspection goes through SQLAlchemy's inspector instead
+    (see app/utils/schema_cache.py).
+    """
+
+    name = ""
+    ping_query = "SELECT 1"
+    # Whether the schema should be created from the models on startup
+    creates_schema = False
+
+    def __init__(self, settings):
+        self.settings = settings
+
+    @abstractmethod
+    def database_url(self) -> str:
+        ...
+
+    @abstractmethod
+    def async_database_url(self) -> str:
+        ...
+
+    def pool_options(self) -> Dict[str, Any]:
+        # Pool sizing comes from Settings so it can be tuned per deployment
+        return dict(
+            pool_size=self.settings.DB_POOL_SIZE,
+            max_overflow=self.settings.DB_MAX_OVERFLOW,
+            pool_timeout=self.settings.DB_POOL_TIMEOUT,
+            pool_recycle=self.settings.DB_POOL_RECYCLE,
+            pool_pre_ping=self.settings.DB_POOL_PRE_PING
+        )
+
+    def engine_options(self) -> Dict[str, Any]:
+        return dict(poolclass=TimedQueuePool, **self.pool_options())
+
+    def async_engine_options(self) -> Dict[str, Any]:
+        return dict(poolclass=TimedAsyncAdaptedQueuePool, **self.pool_options())
+
+    def normalize_name(self, name: str) -> str:
+        return name
+
+    @abstractmethod
+    def explain(self, connection: Connection, sql: str) -> List[str]:
+        """Return the execution plan of a literal SQL statement, one step per line."""
+
+    @abstractmethod
+    def is_full_scan(self, plan_step: str) -> bool:
+        """Whether a plan step reads a whole table instead of using an index."""
+
+class OracleDialect(DatabaseDialect):
+    name = "oracle"
+    ping_query = "SELECT 1 FROM DUAL"
+
+    def database_url(self) -> str:
+        # Imported here so the Oracle client library is only loaded when needed
+        import cx_Oracle
+
+        dsn = cx_Oracle.makedsn(
+            self.settings.DB_HOST,
+            self.settings.DB_PORT,
+            service_name=self.settings.DB_SERVICE
+        )
+        return f"oracle+cx_oracle://{self.settings.DB_USER}:{self.settings.DB_PASSWORD}@{dsn}"
+
+    def async_database_url(self) -> str:
+        # python-oracledb's asyncio driver
+        return (
+            f"oracle+oracledb_async://{self.settings.DB_USER}:{self.settings.DB_PASSWORD}"
+            f"@{self.settings.DB_HOST}:{self.settings.DB_PORT}/?service_name={self.settings.DB_SERVICE}"
+        )
+
+    def normalize_name(self, name: str) -> str:
+        # Unquoted Oracle identifiers are stored upper case
+        return name.upper()
+
+    def explain(self, connection: Connection, sql: str) -> List[str]:
+        statement_id = uuid.uuid4().hex[:30]
+        connection.execute(text(f"EXPLAIN PLAN SET STATEMENT_ID = '{statement_id}' FOR {sql}"))
+        rows = connection.execute(
+            text(
+                "SELECT operation, options, object_name FROM PLAN_TABLE "
+                "WHERE statement_id = :statement_id ORDER BY id"
+            ),
+            {"statement_id": statement_id}
+        )
+        plan = [" ".join(part for part in row if part) for row in rows]
+        connection.execute(text("DELETE FROM PLAN_TABLE WHERE statement_id = :statement_id"), {"statement_id": statement_id})
+        return plan
+
+    def is_full_scan(self, plan_step: str) -> bool:
+        return plan_step.startswith("TABLE ACCESS FULL")
+
+class SQLiteDialect(DatabaseDialect):
+    """
+    Embedded stand-in backend for local development, CI and benchmarks.
+    The schema is created from the models, so no external database is needed.
+    """
+
+    name = "sqlite"
+    creates_schema = True
+
+    @property
+    def in_memory(self) -> bool:
+        return self.settings.SQLITE_PATH == ":memory:"
+
+    def database_url(self) -> str:
+        return f"sqlite:///{self.settings.SQLITE_PATH}"
+
+    def async_database_url(self) -> str:
+        return f"sqlite+aiosqlite:///{self.settings.SQLITE_PATH}"
+
+    def engine_options(self) -> Dict[str, Any]:
+        options = {"connect_args": {"check_same_thread": False}}
+        if self.in_memory:
+            # A private in-memory database per connection would be empty,
+            # so every checkout shares the one connection
+            options["poolclass"] = StaticPool
+        else:
+            options.update(super().engine_options())
+        return options
+
+    def async_engine_options(self) -> Dict[str, Any]:
+        options = {"connect_args": {"check_same_thread": False}}
+        if self.in_memory:
+            options["poolclass"] = StaticPool
+        else:
+            options.update(super().async_engine_options())
+        return options
+
+    def explain(self, connection: Connection, sql: str) -> List[str]:
+        rows = connection.execute(text(f"EXPLAIN QUERY PLAN {sql}"))
+        return [row[-1] for row in rows]
+
+    def is_full_scan(self, plan_step: str) -> bool:
+        # "SCAN t" reads the table; "SCAN t USING [COVERING] INDEX" and
+        # "SEARCH t USING INDEX" do not
+        return plan_step.startswith("SCAN") and "USING" not in plan_step
+
+DIALECTS = {
+    OracleDialect.name: OracleDialect,
+    SQLiteDialect.name: SQLiteDialect,
+}
+
+def get_dialect(settings, backend: Optional[str] = None) -> DatabaseDialect:
+    backend = (backend or settings.DB_BACKEND).lower()
+    try:
+        return DIALECTS[backend](settings)
+    except KeyError:
+        raise ValueError(
+            f"Unsupported DB_BACKEND '{backend}'. "
+            f"Expected one of: {', '.join(sorted(DIALECTS))}"
+        )
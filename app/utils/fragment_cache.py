@@ -0,0 +1,131 @@
+from collections import OrderedDict
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Hashable, Optional, Tuple
+import threading
+import time
+from app.config import settings
+
+class DataVersion:
+    """
+    Counter bumped after every commit that wrote something. Cached
+    fragments are keyed by it, so a write invalidates them without
+    tracking which fragments depend on which rows.
+
+    The counter is per process; FRAGMENT_CACHE_TTL bounds how long another
+    worker's writes can go unseen.
+    """
+
+    def __init__(self):
+        self.current = 0
+        self._lock = threading.Lock()
+
+    def bump(self):
+        with self._lock:
+            self.current += 1
+
+data_version = DataVersion()
+
+# Writes are noted on the session and only bumped once committed, so a
+# concurrent render cannot cache pre-commit data under the new version
+@event.listens_for(Session, "after_flush")
+def _note_flush(session, flush_context):
+    if session.new or session.dirty or session.deleted:
+        session.info["wrote"] = True
+
+@event.listens_for(Session, "do_orm_execute")
+def _note_dml(orm_execute_state):
+    from app.database import is_write_statement
+
+    if is_write_statement(orm_execute_state.statement):
+        orm_execute_state.session.info["wrote"] = True
+
+@event.listens_for(Session, "after_commit")
+def _bump_on_commit(session):
+    if session.info.pop("wrote", False):
+        data_version.bump()
+
+@event.listens_for(Session, "after_rollback")
+def _forget_writes(session):
+    session.info.pop("wrote", None)
+
+class FragmentCache:
+    """Bounded LRU of rendered HTML fragments with a time-to-live."""
+
+    def __init__(self, max_size: Optional[int] = None, ttl: Optional[int] = None):
+        self.max_size = max_size or settings.FRAGMENT_CACHE_SIZE
+        self.ttl = ttl if ttl is not None else settings.FRAGMENT_CACHE_TTL
+        self._entries: "OrderedDict[Hashable, Tuple[float, Markup]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Markup]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, html: Markup):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, html)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "data_version": data_version.current,
+        }
+
+fragment_cache = FragmentCache()
+
+class FragmentCacheExtension(Extension):
+    """
+    {% cache "name", department_id %} ... {% endcache %}
+
+    Renders the block once per (name, extra key parts, data version) and
+    serves the stored HTML afterwards. Anything the block calls, such as
+    lazy stats callables, only runs on a miss.
+
+    Misses are rendered with reads on the primary. The version is bumped
+    when the primary commits, so a replica that has not caught up yet
+    would otherwise be cached as the new version until the TTL.
+    """
+
+    tags = {"cache"}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [parser.parse_expression()]
+        while parser.stream.skip_if("comma"):
+            args.append(parser.parse_expression())
+        body = parser.parse_statements(("name:endcache",), drop_needle=True)
+        return nodes.CallBlock(
+            self.call_method("_render", [nodes.List(args)]), [], [], body
+        ).set_lineno(lineno)
+
+    def _render(self, key_parts, caller):
+        from app.database import read_from_primary
+
+        key = (*key_parts, data_version.current)
+        html = fragment_cache.get(key)
+        if html is None:
+            with read_from_primary():
+                html = Markup(caller())
+            fragment_cache.set(key, html)
+        return html
@@ -0,0 +1,95 @@
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from typing import Dict, Any
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class _CheckoutTimerMixin:
+    """
+    Records how long callers wait for pool.connect() to hand back a
+    connection, including time spent opening a new one or blocking on a
+    full pool, and how many checkouts ran into pool_timeout.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self._checkouts = 0
+        self._checkout_timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except Exception:
+            with self._stats_lock:
+                self._checkout_timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            with self._stats_lock:
+                self._checkouts += 1
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+
+    def checkout_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "checkouts": self._checkouts,
+                "checkout_failures": self._checkout_timeouts,
+                "checkout_wait_total_ms": round(self._wait_total * 1000, 3),
+                "checkout_wait_avg_ms": round(self._wait_total * 1000 / self._checkouts, 3) if self._checkouts else 0.0,
+                "checkout_wait_max_ms": round(self._wait_max * 1000, 3),
+            }
+
+class TimedQueuePool(_CheckoutTimerMixin, QueuePool):
+    pass
+
+class TimedAsyncAdaptedQueuePool(_CheckoutTimerMixin, AsyncAdaptedQueuePool):
+    pass
+
+def pool_status(engine: Engine) -> Dict[str, Any]:
+    """
+    Snapshot of an engine's pool: configured size, connections in use,
+    overflow in use and checkout wait statistics.
+    """
+    pool = engine.pool
+    status: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "in_use": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+            "timeout": pool.timeout(),
+        })
+    if isinstance(pool, _CheckoutTimerMixin):
+        status.update(pool.checkout_stats())
+    return status
+
+def warm_pool(engine: Engine, connections: int) -> int:
+    """
+    Open up to `connections` connections and return them to the pool so
+    the first requests after startup do not pay the connect latency.
+    Returns the number of connections that were opened.
+    """
+    pool = engine.pool
+    if isinstance(pool, QueuePool):
+        connections = min(connections, pool.size())
+    opened = []
+    try:
+        for _ in range(max(connections, 0)):
+            opened.append(engine.connect())
+    except Exception as e:
+        logger.warning(f"Pool warm-up stopped after {len(opened)} connections: {str(e)}")
+    finally:
+        for connection in opened:
+            connection.close()
+    logger.info(f"Warmed connection pool with {len(opened)} connections")
+    return len(opened)
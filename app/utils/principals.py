@@ -0,0 +1,180 @@
+from fastapi import WebSocket
+from itertools import chain
+from jose import JWTError, jwt
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from typing import Dict, NamedTuple, Optional
+import asyncio
+import logging
+import threading
+import time
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+class Principal(NamedTuple):
+    user_id: int
+    username: str
+    role: str
+    is_active: bool
+    department_id: Optional[int]
+
+def _principal_query():
+    from app.models import Employee, User
+
+    return (
+        select(User.userID, User.username, User.role, User.is_active, Employee.department)
+        .outerjoin(Employee, Employee.userID == User.userID)
+    )
+
+def _principal(row) -> Principal:
+    user_id, username, role, is_active, department_id = row
+    return Principal(user_id, username, role, bool(is_active), department_id)
+
+class PrincipalCache:
+    """
+    username -> (user id, role, department) for every user, loaded with a
+    single query and reloaded after PRINCIPAL_CACHE_TTL seconds. Lets the
+    WebSocket handshake identify a client without touching the database,
+    so a reconnect storm after a deploy costs at most one reload.
+    """
+
+    def __init__(self):
+        self._principals: Dict[str, Principal] = {}
+        self._lock = threading.Lock()
+        self._refresh_lock = asyncio.Lock()
+        self.loaded_at: Optional[float] = None
+        self._generation = 0
+        self._written = False
+
+    def refresh(self) -> None:
+        from app.database import get_engine, get_read_engine
+
+        with self._lock:
+            generation, written = self._generation, self._written
+        # After a write the replica may still hold the old rows
+        engine = get_engine() if written else get_read_engine()
+        start = time.perf_counter()
+        with engine.connect() as connection:
+            principals = {row[1]: _principal(row) for row in connection.execute(_principal_query())}
+        with self._lock:
+            self._principals = principals
+            # Invalidated while loading: what we read may predate the write
+            if generation == self._generation:
+                self.loaded_at = time.time()
+                self._written = False
+        logger.info(f"Loaded {len(principals)} principals in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    async def preload(self) -> bool:
+        """
+        Initial load at startup, retried with the DB_CONNECT_* backoff.
+        Returns whether it succeeded; if not, the first handshake loads
+        the cache instead.
+        """
+        delay = settings.DB_CONNECT_BACKOFF
+        for attempt in range(1, settings.DB_CONNECT_RETRIES + 1):
+            try:
+                await asyncio.to_thread(self.refresh)
+                return True
+            except Exception as e:
+                logger.error(f"Failed to load principals (attempt {attempt}/{settings.DB_CONNECT_RETRIES}): {str(e)}")
+                if attempt < settings.DB_CONNECT_RETRIES:
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, settings.DB_CONNECT_BACKOFF_MAX)
+        return False
+
+    def _load_one(self, username: str) -> Optional[Principal]:
+        # Users created since the last reload
+        from app.database import get_read_engine
+        from app.models import User
+
+        with get_read_engine().connect() as connection:
+            row = connection.execute(_principal_query().where(User.username == username)).first()
+        if row is None:
+            return None
+        principal = _principal(row)
+        with self._lock:
+            self._principals[username] = principal
+        return principal
+
+    def invalidate(self) -> None:
+        """Reload from the primary on the next handshake."""
+        with self._lock:
+            self._generation += 1
+            self.loaded_at = None
+            self._written = True
+
+    @property
+    def invalidated(self) -> bool:
+        """True between a committed User/Employee write and the next reload."""
+        return self._written
+
+    def _is_stale(self) -> bool:
+        return self.loaded_at is None or time.time() - self.loaded_at > settings.PRINCIPAL_CACHE_TTL
+
+    async def ensure_fresh(self) -> None:
+        if self._is_stale():
+            # One reload, however many handshakes are waiting on it
+            async with self._refresh_lock:
+                if self._is_stale():
+                    await asyncio.to_thread(self.refresh)
+
+    def by_user_id(self) -> Dict[int, Principal]:
+        return {principal.user_id: principal for principal in self._principals.values()}
+
+    async def resolve(self, username: str) -> Optional[Principal]:
+        await self.ensure_fresh()
+        principal = self._principals.get(username)
+        if principal is None:
+            principal = await asyncio.to_thread(self._load_one, username)
+        return principal
+
+principal_cache = PrincipalCache()
+
+# A deactivated user or a department move must not wait out the TTL.
+# Changes are noted on the session and acted on once committed.
+_PRINCIPAL_TABLES = ("USERS", "EMPLOYEES")
+
+@event.listens_for(Session, "after_flush")
+def _note_principal_flush(session, flush_context):
+    from app.models import Employee, User
+
+    if any(isinstance(obj, (User, Employee)) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info["principals_changed"] = True
+
+@event.listens_for(Session, "do_orm_execute")
+def _note_principal_dml(orm_execute_state):
+    from app.database import is_write_statement
+
+    statement = orm_execute_state.statement
+    table = getattr(statement, "table", None)
+    if is_write_statement(statement) and getattr(table, "name", None) in _PRINCIPAL_TABLES:
+        orm_execute_state.session.info["principals_changed"] = True
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session):
+    if session.info.pop("principals_changed", False):
+        principal_cache.invalidate()
+
+@event.listens_for(Session, "after_rollback")
+def _forget_principal_changes(session):
+    session.info.pop("principals_changed", None)
+
+async def websocket_principal(websocket: WebSocket) -> Optional[Principal]:
+    """The active user behind the handshake's access_token cookie, if any."""
+    token = websocket.cookies.get("access_token")
+    if not token:
+        return None
+    if token.startswith("Bearer "):
+        token = token[7:]
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
+    username = payload.get("sub")
+    if username is None:
+        return None
+    principal = await principal_cache.resolve(username)
+    if principal is None or not principal.is_active:
+        return None
+    return principal
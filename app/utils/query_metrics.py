@@ -0,0 +1,113 @@
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+import logging
+import re
+import time
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+def statement_shape(statement: str) -> str:
+    """
+    Reduce a SQL statement to its template so that the same query issued
+    with different literals or IN-list lengths counts as one shape.
+    """
+    shape = _STRING_LITERAL.sub("?", statement)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _IN_LIST.sub("(?)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+class RequestQueryStats:
+    """Queries issued while handling one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.total_time += elapsed
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated_shapes(self, threshold: int):
+        return [(shape, n) for shape, n in self.shapes.most_common() if n > threshold]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.total_time * 1000:.2f};desc="{self.count} queries"'
+
+_current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+def current_query_stats() -> Optional[RequestQueryStats]:
+    return _current_stats.get()
+
+# The start time lives on the execution context rather than the pooled
+# connection: after_cursor_execute does not fire for a failed statement,
+# and the context is discarded with it
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_start_time = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_query_start_time", None)
+    if start is None:
+        return
+    elapsed = time.perf_counter() - start
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+def install_query_listeners(engine: Engine):
+    """Attach the cursor timing hooks to an engine (idempotent)."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+class QueryMetricsMiddleware:
+    """
+    Counts the queries each HTTP request issues and the time spent in
+    them, reports both in a Server-Timing header, and logs a warning when
+    one statement shape repeats more than `repeat_threshold` times within
+    a request (the usual signature of an N+1 loop).
+    """
+
+    def __init__(self, app: ASGIApp, repeat_threshold: Optional[int] = None):
+        self.app = app
+        self.repeat_threshold = (
+            settings.QUERY_REPEAT_WARN_THRESHOLD if repeat_threshold is None else repeat_threshold
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = _current_stats.set(stats)
+
+        async def send_with_timing(message: Message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", stats.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+            path = f"{scope['method']} {scope['path']}"
+            for shape, repeats in stats.repeated_shapes(self.repeat_threshold):
+                logger.warning(
+                    f"Possible N+1 query in {path}: statement repeated {repeats} times: {shape}"
+                )
+            logger.debug(f"{path} issued {stats.count} queries in {stats.total_time * 1000:.2f}ms")
@@ -0,0 +1,111 @@
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Callable, Dict, Iterable, Tuple
+import logging
+import time
+
+# A registry of our own, so the exposition holds only these metrics and
+# importing the module twice (reloaders, tests) cannot double-register
+registry = CollectorRegistry()
+
+logger = logging.getLogger(__name__)
+
+REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route and status code",
+    ["method", "route", "status"], registry=registry
+)
+LATENCY = Histogram(
+    "http_request_duration_seconds", "Time from request start to the last response byte",
+    ["method", "route"], registry=registry,
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes", "Response body size",
+    ["method", "route"], registry=registry,
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+)
+IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "Requests currently being handled",
+    ["method"], registry=registry
+)
+
+def _route_label(scope: Scope) -> str:
+    """
+    The route template (/admin/users/{user_id}) rather than the raw path,
+    so label cardinality stays bounded.
+    """
+    route = scope.get("route")
+    if route is not None and hasattr(route, "path"):
+        return route.path
+    if scope.get("endpoint") is not None:
+        # Mounted application such as /static
+        return scope.get("root_path") or "mount"
+    return "unmatched"
+
+class RequestMetricsMiddleware:
+    """
+    Records latency, status code, response size and in-flight count for
+    every HTTP request, labelled by route template.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        size = 0
+        start = time.perf_counter()
+
+        async def send_with_metrics(message: Message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        IN_PROGRESS.labels(method).inc()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            IN_PROGRESS.labels(method).dec()
+            route = _route_label(scope)
+            REQUESTS.labels(method, route, str(status)).inc()
+            LATENCY.labels(method, route).observe(time.perf_counter() - start)
+            RESPONSE_SIZE.labels(method, route).observe(size)
+
+class CallbackCollector:
+    """
+    Collects gauges and counters by calling `source` at scrape time, so
+    pool and WebSocket state is read only when Prometheus asks for it.
+    `source` returns {metric name: (help, type, {label tuple: value})}.
+    """
+
+    def __init__(self, labels: Tuple[str, ...],
+                 source: Callable[[], Dict[str, Tuple[str, str, Dict[Tuple[str, ...], float]]]]):
+        self.labels = list(labels)
+        self.source = source
+
+    def collect(self) -> Iterable:
+        # A broken source (say, the database is down) drops its own families
+        # but must not fail the scrape for request metrics
+        try:
+            families = self.source()
+        except Exception:
+            logger.exception("Metrics source %s failed", getattr(self.source, "__name__", self.source))
+            return
+        for name, (documentation, kind, samples) in families.items():
+            family_class = CounterMetricFamily if kind == "counter" else GaugeMetricFamily
+            family = family_class(name, documentation, labels=self.labels)
+            for label_values, value in samples.items():
+                family.add_metric(list(label_values), value)
+            yield family
+
+def render_metrics() -> bytes:
+    return generate_latest(registry)
@@ -0,0 +1,73 @@
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.types import TypeEngine
+from typing import Dict, List, Optional
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class SchemaCache:
+    """
+    In-memory copy of the database schema, reflected once through
+    SQLAlchemy's inspector (a single bulk column query per schema rather
+    than a data dictionary query per call).
+
+    Call refresh() after migrations or invalidate() to reload lazily.
+    Table names are matched case-insensitively.
+    """
+
+    def __init__(self):
+        self._tables: Optional[Dict[str, List[Dict]]] = None
+        self._lock = threading.Lock()
+        self.loaded_at: Optional[float] = None
+
+    def refresh(self, engine: Engine) -> None:
+        from app.database import dialect
+
+        start = time.perf_counter()
+        inspector = inspect(engine)
+        tables: Dict[str, List[Dict]] = {}
+        for (_, table_name), columns in inspector.get_multi_columns().items():
+            tables[table_name.lower()] = [
+                {
+                    "column_name": dialect.normalize_name(column["name"]),
+                    "data_type": str(column["type"]),
+                    "data_length": getattr(column["type"], "length", None),
+                    "nullable": "Y" if column["nullable"] else "N",
+                    "type": column["type"],
+                }
+                for column in columns
+            ]
+        with self._lock:
+            self._tables = tables
+            self.loaded_at = time.time()
+        logger.info(f"Loaded schema for {len(tables)} tables in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._tables = None
+            self.loaded_at = None
+
+    def _tables_for(self, engine: Engine) -> Dict[str, List[Dict]]:
+        tables = self._tables
+        if tables is None:
+            self.refresh(engine)
+            tables = self._tables
+        return tables
+
+    def table_exists(self, engine: Engine, table_name: str) -> bool:
+        return table_name.lower() in self._tables_for(engine)
+
+    def get_columns(self, engine: Engine, table_name: str) -> List[Dict]:
+        return list(self._tables_for(engine).get(table_name.lower(), []))
+
+    def get_column_types(self, engine: Engine, table_name: str) -> Dict[str, TypeEngine]:
+        return {
+            column["column_name"]: column["type"]
+            for column in self._tables_for(engine).get(table_name.lower(), [])
+        }
+
+# Create a global instance
+schema_cache = SchemaCache()
@@ -0,0 +1,66 @@
+from fastapi import HTTPException, Response
+from pydantic import BaseModel
+from typing import Any, Dict, Optional, Type, get_args, get_origin
+import json
+from app.schemas import type_adapter
+
+# orjson is several times faster than the stdlib encoder and handles
+# datetime/date natively; fall back to json when it is not installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def dumps(obj: Any) -> str:
+    """Encode obj as compact JSON text. Unknown types are stringified."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, default=str, separators=(",", ":"))
+
+def loads(data: Any) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _item_model(annotation: Any) -> Optional[Type[BaseModel]]:
+    """The model of a List[Model] field, or None for any other field."""
+    if get_origin(annotation) is not list:
+        return None
+    args = get_args(annotation)
+    if args and isinstance(args[0], type) and issubclass(args[0], BaseModel):
+        return args[0]
+    return None
+
+def _field_selection(model: Type, fields: str) -> Dict:
+    """
+    Turn ?fields=a,b,c.d into a pydantic include spec. A dotted name picks
+    a field of a nested list of models (c.d keeps d of every item in c).
+    """
+    include: Dict[str, Any] = {}
+    for name in filter(None, (part.strip() for part in fields.split(","))):
+        field, _, subfield = name.partition(".")
+        if field not in model.model_fields:
+            raise HTTPException(status_code=400, detail=f"Unknown field '{field}'")
+        if not subfield:
+            include[field] = True
+            continue
+        item_model = _item_model(model.model_fields[field].annotation)
+        if item_model is None:
+            raise HTTPException(status_code=400, detail=f"Field '{field}' has no subfields")
+        if subfield not in item_model.model_fields:
+            raise HTTPException(status_code=400, detail=f"Unknown field '{name}'")
+        if include.get(field) is not True:
+            items = include.setdefault(field, {"__all__": set()})["__all__"]
+            items.add(subfield)
+    return include
+
+def json_response(model: Type, data: Dict, fields: Optional[str] = None) -> Response:
+    """
+    Validate data against a response model and serialize it in one pass
+    through the model's cached TypeAdapter, optionally keeping only the
+    requested fields.
+    """
+    adapter = type_adapter(model)
+    include = _field_selection(model, fields) if fields else None
+    body = adapter.dump_json(adapter.validate_python(data), include=include)
+    return Response(content=body, media_type="application/json")
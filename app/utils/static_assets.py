@@ -0,0 +1,156 @@
+from fastapi.concurrency import run_in_threadpool
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.types import Scope
+from typing import Dict, NamedTuple, Optional
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+import time
+from app.config import BASE_DIR, settings
+
+# Brotli is optional; without it only gzip variants are prepared
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+STATIC_DIR = os.path.join(BASE_DIR, "static")
+STATIC_PREFIX = "/static/"
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+
+class Asset(NamedTuple):
+    path: str  # relative to the static directory
+    url_path: str  # fingerprinted relative path
+    mtime: float
+    etag: str
+    media_type: str
+    variants: Dict[str, bytes]  # content-encoding -> body
+
+def _fingerprinted(path: str, digest: str) -> str:
+    root, ext = os.path.splitext(path)
+    return f"{root}.{digest[:10]}{ext}"
+
+def _accepted_encodings(accept_encoding: str) -> Dict[str, float]:
+    encodings = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            encodings[name.strip().lower()] = quality
+    return encodings
+
+class StaticAssets(StaticFiles):
+    """
+    StaticFiles that also serves every file under a content-hashed name,
+    e.g. css/style.css as css/style.1a2b3c4d5e.css. Templates link to the
+    hashed name via static_url(), so those responses can be cached as
+    immutable; editing a file changes its URL.
+
+    Hashes and gzip/brotli variants are computed by build(), which the
+    app lifespan runs at startup, and served from memory. Until then
+    static_url() returns plain names, which always work, with
+    revalidation.
+    """
+
+    def __init__(self, directory: str = STATIC_DIR, **kwargs):
+        super().__init__(directory=directory, **kwargs)
+        self.root = directory
+        self._assets: Dict[str, Asset] = {}
+        self._by_url: Dict[str, Asset] = {}
+        self.built = False
+
+    def build(self) -> None:
+        start = time.perf_counter()
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                path = os.path.relpath(os.path.join(dirpath, filename), self.root).replace(os.sep, "/")
+                self._load(path)
+        self.built = True
+        logger.info(f"Fingerprinted {len(self._assets)} static assets in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    def _load(self, path: str) -> Optional[Asset]:
+        full_path = os.path.join(self.root, path)
+        try:
+            mtime = os.path.getmtime(full_path)
+            with open(full_path, "rb") as f:
+                body = f.read()
+        except OSError:
+            return None
+
+        digest = hashlib.sha256(body).hexdigest()
+        media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        variants = {"identity": body}
+        if media_type.startswith(COMPRESSIBLE_TYPES):
+            compressed = gzip.compress(body, compresslevel=9, mtime=0)
+            if len(compressed) < len(body):
+                variants["gzip"] = compressed
+            if brotli is not None:
+                compressed = brotli.compress(body)
+                if len(compressed) < len(body):
+                    variants["br"] = compressed
+
+        previous = self._assets.get(path)
+        if previous is not None:
+            self._by_url.pop(previous.url_path, None)
+        asset = Asset(path, _fingerprinted(path, digest), mtime, f'"{digest[:16]}"', media_type, variants)
+        self._assets[path] = asset
+        self._by_url[asset.url_path] = asset
+        return asset
+
+    def url(self, path: str) -> str:
+        """URL of a static file, fingerprinted when the file exists."""
+        path = path.lstrip("/")
+        asset = self._assets.get(path)
+        # While developing, pick up edited files without a restart
+        if settings.DEBUG:
+            full_path = os.path.join(self.root, path)
+            if os.path.isfile(full_path) and (asset is None or os.path.getmtime(full_path) != asset.mtime):
+                asset = self._load(path)
+        if asset is None:
+            return STATIC_PREFIX + path
+        return STATIC_PREFIX + asset.url_path
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if not self.built:
+            # Served without a lifespan (some test clients, or a hashed URL
+            # requested during startup): build on demand
+            await run_in_threadpool(self.build)
+        asset = self._by_url.get(path.replace(os.sep, "/"))
+        if asset is None or scope["method"] not in ("GET", "HEAD"):
+            response = await super().get_response(path, scope)
+            if response.status_code == 200:
+                response.headers["Cache-Control"] = "no-cache"
+            return response
+
+        request_headers = Headers(scope=scope)
+        headers = {"Cache-Control": IMMUTABLE, "ETag": asset.etag, "Vary": "Accept-Encoding"}
+        if request_headers.get("if-none-match") == asset.etag:
+            return Response(status_code=304, headers=headers)
+
+        accepted = _accepted_encodings(request_headers.get("accept-encoding", ""))
+        encoding = next(
+            (name for name in ("br", "gzip") if name in asset.variants and accepted.get(name, 0) > 0),
+            "identity"
+        )
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        body = asset.variants[encoding]
+        if scope["method"] == "HEAD":
+            headers["Content-Length"] = str(len(body))
+            return Response(status_code=200, headers=headers, media_type=asset.media_type)
+        return Response(body, headers=headers, media_type=asset.media_type)
+
+static_assets = StaticAssets()
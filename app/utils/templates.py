@@ -0,0 +1,107 @@
+from fastapi.responses import StreamingResponse
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, TemplateError
+from markupsafe import Markup
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Iterator, Mapping, Optional
+import logging
+import os
+import time
+from app.config import BASE_DIR, settings
+from app.utils.fragment_cache import FragmentCacheExtension
+from app.utils.static_assets import static_assets
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = os.path.join(BASE_DIR, "templates")
+
+# One environment for every router, so each template is compiled once per
+# process. Compiled bytecode is kept on disk and reused across restarts
+# and workers; auto_reload (a stat per render) is only wanted while
+# editing templates.
+environment = Environment(
+    loader=FileSystemLoader(TEMPLATE_DIR),
+    autoescape=True,
+    auto_reload=settings.DEBUG,
+    bytecode_cache=FileSystemBytecodeCache(settings.TEMPLATE_CACHE_DIR),
+    cache_size=-1,
+    extensions=[FragmentCacheExtension],
+)
+
+# {{ flush() }} marks a point where a streamed page should send what it
+# has so far, e.g. the page header before a long table. It is dropped from
+# streamed output and harmless in buffered renders.
+FLUSH_MARKER = Markup("<!--flush-->")
+
+environment.globals["static_url"] = static_assets.url
+environment.globals["flush"] = lambda: FLUSH_MARKER
+
+templates = Jinja2Templates(env=environment)
+
+class StreamingTemplateResponse(StreamingResponse):
+    """
+    Renders a template incrementally with Template.generate(), sending
+    output in chunks of TEMPLATE_STREAM_CHUNK_SIZE bytes and at every
+    {{ flush() }}. Combined with a lazily iterated query (stream_query),
+    neither the rows nor the page are ever held in memory whole.
+
+    Rendering happens after the route returns, so the query needs a
+    session of its own; pass it as `session` to have it closed when the
+    page is done.
+    """
+
+    def __init__(self, name: str, context: Dict[str, Any], session: Optional[Session] = None,
+                 status_code: int = 200, headers: Optional[Mapping[str, str]] = None,
+                 chunk_size: Optional[int] = None):
+        template = environment.get_template(name)
+        self.template = template
+        self.context = context
+        super().__init__(
+            self._render(template, context, session, chunk_size or settings.TEMPLATE_STREAM_CHUNK_SIZE),
+            status_code=status_code,
+            headers=headers,
+            media_type="text/html",
+        )
+
+    @staticmethod
+    def _render(template, context: Dict[str, Any], session: Optional[Session], chunk_size: int) -> Iterator[str]:
+        buffer = []
+        size = 0
+        try:
+            for piece in template.generate(context):
+                if piece == FLUSH_MARKER:
+                    if buffer:
+                        yield "".join(buffer)
+                        buffer, size = [], 0
+                    continue
+                buffer.append(piece)
+                size += len(piece)
+                if size >= chunk_size:
+                    yield "".join(buffer)
+                    buffer, size = [], 0
+            if buffer:
+                yield "".join(buffer)
+        except Exception as e:
+            # Headers are already sent; all that is left is to log it
+            logger.error(f"Error streaming template {template.name}: {str(e)}")
+            raise
+        finally:
+            if session is not None:
+                session.close()
+
+def precompile_templates() -> int:
+    """
+    Load every template so the first request after a deploy does not pay
+    for parsing and compiling. Templates that fail to compile are logged
+    and left for the request that renders them to report.
+    """
+    start = time.perf_counter()
+    compiled = 0
+    for name in environment.list_templates(extensions=["html"]):
+        try:
+            environment.get_template(name)
+            compiled += 1
+        except TemplateError as e:
+            logger.error(f"Template {name} failed to compile: {str(e)}")
+    logger.info(f"Compiled {compiled} templates in {(time.perf_counter() - start) * 1000:.1f}ms")
+    return compiled
@@ -0,0 +1,91 @@
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+import asyncio
+import logging
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Keys tried, in order, to decide which entity an update is about
+ENTITY_KEYS = ('id', 'task_id', 'employee_id', 'skill_id', 'course_id', 'metric_id')
+
+def _entity_id(message: dict) -> Optional[Hashable]:
+    data = message.get('data')
+    if isinstance(data, dict):
+        for key in ENTITY_KEYS:
+            value = data.get(key)
+            if value is not None:
+                return (key, value)
+    return None
+
+class UpdateBatcher:
+    """
+    Holds department update messages for a short window and sends them as
+    one frame. Within a window a newer update for the same (type, entity)
+    replaces the older one, so a burst of edits to one task reaches the
+    client as its final state.
+
+    A window with a single update is sent unchanged; otherwise clients
+    receive {"type": "batch", "updates": [...]} in first-seen order.
+    """
+
+    def __init__(self, send: Callable[[dict, int], Awaitable[None]], window_ms: Optional[int] = None):
+        self._send = send
+        self.window = (settings.WS_BATCH_WINDOW_MS if window_ms is None else window_ms) / 1000
+        self._pending: Dict[int, Dict[Tuple[Any, Any], dict]] = {}
+        self._timers: Dict[int, asyncio.Task] = {}
+        self.received = 0
+        self.merged = 0
+        self.frames = 0
+
+    async def add(self, message: dict, department_id: int):
+        self.received += 1
+        if self.window <= 0:
+            self.frames += 1
+            await self._send(message, department_id)
+            return
+
+        pending = self._pending.setdefault(department_id, {})
+        entity = _entity_id(message)
+        # Updates without a recognisable entity are never merged
+        key = (message.get('type'), entity if entity is not None else object())
+        if key in pending:
+            self.merged += 1
+        pending[key] = message
+        if department_id not in self._timers:
+            self._timers[department_id] = asyncio.create_task(self._flush_later(department_id))
+
+    async def _flush_later(self, department_id: int):
+        await asyncio.sleep(self.window)
+        self._timers.pop(department_id, None)
+        try:
+            await self.flush(department_id)
+        except Exception as e:
+            logger.error(f"Error flushing batched updates for department {department_id}: {str(e)}")
+
+    async def flush(self, department_id: int):
+        pending = self._pending.pop(department_id, None)
+        if not pending:
+            return
+        updates = list(pending.values())
+        self.frames += 1
+        if len(updates) == 1:
+            await self._send(updates[0], department_id)
+        else:
+            await self._send({'type': 'batch', 'updates': updates}, department_id)
+
+    async def flush_all(self):
+        """Send everything still pending; used on shutdown."""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        for department_id in list(self._pending):
+            await self.flush(department_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "window_ms": int(self.window * 1000),
+            "pending": sum(len(updates) for updates in self._pending.values()),
+            "received": self.received,
+            "merged": self.merged,
+            "frames": self.frames,
+        }
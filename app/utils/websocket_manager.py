@@ -1,19 +1,76 @@
 from fastapi import WebSocket
-from typing import Dict, List, Set
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import asyncio
 import json
 import logging
+import time
 from datetime import datetime
+from app.config import settings
+from app.utils.broker import Broker, create_broker
+from app.utils.principals import principal_cache
+from app.utils.websocket_batching import UpdateBatcher
+from app.utils.websocket_outbound import Frame, OutboundQueue, encode_frame
+from app.utils.websocket_replay import ReplayLog
 
 logger = logging.getLogger(__name__)
 
+# Sent to every socket each heartbeat interval; clients answer with a pong
+PING_FRAME = encode_frame({'type': 'ping'})
+
+def _connection_key(value):
+    # Channel names carry ids as text; sockets are indexed by int ids
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    return value
+
 class WebSocketManager:
-    def __init__(self):
+    """
+    Tracks this process's sockets by user and department. Messages are
+    published through a Broker so that, with several workers, each
+    worker delivers them to the sockets it holds.
+    """
+
+    def __init__(self, broker: Optional[Broker] = None):
+        self.broker = broker or create_broker()
+        self.broker.subscribe(self._deliver)
+        # Entity updates are batched per department; direct messages are not
+        self.batcher = UpdateBatcher(self.broadcast_to_department)
+        self.replay = ReplayLog()
         self.active_connections: Dict[str, List[WebSocket]] = {}
         self.user_connections: Dict[int, Set[WebSocket]] = {}
         self.department_connections: Dict[int, Set[WebSocket]] = {}
+        # Reverse index so a failed socket can be removed from both maps
+        self.connection_info: Dict[WebSocket, Tuple[int, Optional[int]]] = {}
+        # Every socket gets a bounded outbound queue and its own writer task
+        self.outbound: Dict[WebSocket, OutboundQueue] = {}
+        # Monotonic connect and last-heard-from times, for the heartbeat
+        self.connected_at: Dict[WebSocket, float] = {}
+        self.last_seen: Dict[WebSocket, float] = {}
+        self._heartbeat: Optional[asyncio.Task] = None
+        self.reaped = 0
+        self.evicted = 0
+
+    async def start(self):
+        await self.broker.start()
+        self._heartbeat = asyncio.create_task(self._heartbeat_loop())
 
-    async def connect(self, websocket: WebSocket, user_id: int, department_id: int):
+    async def stop(self):
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            self._heartbeat = None
+        await self.batcher.flush_all()
+        await self.broker.stop()
+
+    async def connect(self, websocket: WebSocket, user_id: int, department_id: Optional[int] = None,
+                      resume: Optional[dict] = None):
+        """
+        Register a socket. `resume` is the client's {"epoch", "channels":
+        {channel: last_seq}} from a previous connection; missed frames are
+        queued before any live message can reach the socket.
+        """
         await websocket.accept()
+        user_id = _connection_key(user_id)
+        self._enforce_connection_cap(user_id)
         
         # Add to user connections
         if user_id not in self.user_connections:
@@ -21,13 +78,32 @@ class WebSocketManager:
         self.user_connections[user_id].add(websocket)
         
         # Add to department connections
-        if department_id not in self.department_connections:
-            self.department_connections[department_id] = set()
-        self.department_connections[department_id].add(websocket)
+        if department_id is not None:
+            if department_id not in self.department_connections:
+                self.department_connections[department_id] = set()
+            self.department_connections[department_id].add(websocket)
         
+        self.connection_info[websocket] = (user_id, department_id)
+        queue = OutboundQueue(websocket, on_failure=self._drop)
+        self.outbound[websocket] = queue
+        self.connected_at[websocket] = self.last_seen[websocket] = time.monotonic()
+        # No await between registering and queueing the catch-up frames,
+        # so live messages are always ordered after them
+        for frame in self._catch_up(self._channels(user_id, department_id), resume, queue.maxsize):
+            queue.put(frame)
+        queue.start()
         logger.info(f"User {user_id} connected to WebSocket")
 
-    def disconnect(self, websocket: WebSocket, user_id: int, department_id: int):
+    def disconnect(self, websocket: WebSocket, user_id: Optional[int] = None, department_id: Optional[int] = None):
+        info = self.connection_info.pop(websocket, None)
+        if info is not None:
+            user_id, department_id = info
+        queue = self.outbound.pop(websocket, None)
+        if queue is not None:
+            queue.stop()
+        self.connected_at.pop(websocket, None)
+        self.last_seen.pop(websocket, None)
+        
         # Remove from user connections
         if user_id in self.user_connections:
             self.user_connections[user_id].discard(websocket)
@@ -40,39 +116,186 @@ class WebSocketManager:
             if not self.department_connections[department_id]:
                 del self.department_connections[department_id]
         
-        logger.info(f"User {user_id} disconnected from WebSocket")
+        if info is not None:
+            logger.info(f"User {user_id} disconnected from WebSocket")
 
-    async def send_personal_message(self, message: dict, user_id: int):
-        if user_id in self.user_connections:
-            message['timestamp'] = datetime.utcnow().isoformat()
-            for connection in self.user_connections[user_id]:
+    async def _close(self, websocket: WebSocket, code: int):
+        try:
+            await asyncio.wait_for(websocket.close(code=code), timeout=settings.WS_SEND_TIMEOUT)
+        except Exception:
+            pass
+
+    def _drop(self, websocket: WebSocket, code: int = 1011):
+        """Unregister a failed or overflowing socket and close it in the background."""
+        self.disconnect(websocket)
+        asyncio.create_task(self._close(websocket, code))
+
+    def _enforce_connection_cap(self, user_id):
+        """Make room for a new socket by closing the user's oldest ones."""
+        connections = self.user_connections.get(user_id)
+        if not connections:
+            return
+        excess = len(connections) + 1 - settings.WS_MAX_CONNECTIONS_PER_USER
+        if excess <= 0:
+            return
+        oldest = sorted(connections, key=lambda ws: self.connected_at.get(ws, 0))[:excess]
+        for websocket in oldest:
+            logger.info(f"Closing oldest WebSocket for user {user_id}: connection limit reached")
+            self.evicted += 1
+            self._drop(websocket, code=1008)
+
+    def touch(self, websocket: WebSocket):
+        """Record that the client is alive (any message, including pong)."""
+        if websocket in self.last_seen:
+            self.last_seen[websocket] = time.monotonic()
+
+    def reap(self, websocket: WebSocket):
+        """Close a socket that missed its heartbeats."""
+        if websocket in self.connection_info:
+            user_id, _ = self.connection_info[websocket]
+            logger.info(f"Reaping idle WebSocket for user {user_id}")
+            self.reaped += 1
+            self._drop(websocket, code=1001)
+
+    async def revalidate(self):
+        """
+        Close sockets whose user was deactivated, deleted or moved to
+        another department since connecting. Clients reconnect and go
+        through the handshake again, landing on the right channels.
+        """
+        await principal_cache.ensure_fresh()
+        principals = principal_cache.by_user_id()
+        for websocket, (user_id, department_id) in list(self.connection_info.items()):
+            principal = principals.get(user_id)
+            if principal is None or not principal.is_active or principal.department_id != department_id:
+                logger.info(f"Closing WebSocket for user {user_id}: account changed")
+                self._drop(websocket, code=1008)
+
+    async def _heartbeat_loop(self):
+        while True:
+            await asyncio.sleep(settings.WS_HEARTBEAT_INTERVAL)
+            if principal_cache.invalidated:
                 try:
-                    await connection.send_json(message)
+                    await self.revalidate()
                 except Exception as e:
-                    logger.error(f"Error sending message to user {user_id}: {str(e)}")
+                    logger.error(f"WebSocket principal revalidation failed: {e}")
+            cutoff = time.monotonic() - settings.WS_HEARTBEAT_TIMEOUT
+            for websocket, last_seen in list(self.last_seen.items()):
+                if last_seen < cutoff:
+                    self.reap(websocket)
+                    continue
+                queue = self.outbound.get(websocket)
+                if queue is not None and not queue.put(PING_FRAME):
+                    self._drop(websocket)
+
+    def connection_stats(self) -> Dict[str, int]:
+        return {
+            "live": len(self.connection_info),
+            "users": len(self.user_connections),
+            "reaped": self.reaped,
+            "evicted": self.evicted,
+        }
+
+    def _fan_out(self, connections: Iterable[WebSocket], frame: Frame):
+        """
+        Queue an encoded frame on every connection. Writer tasks do the
+        sending concurrently, each bounded by WS_SEND_TIMEOUT, so a
+        broadcast never waits on a slow client.
+        """
+        # Snapshot: sockets can be dropped while iterating
+        for connection in list(connections):
+            queue = self.outbound.get(connection)
+            if queue is not None and not queue.put(frame):
+                user_id, _ = self.connection_info.get(connection, (None, None))
+                logger.warning(f"Disconnecting slow WebSocket consumer for user {user_id}")
+                self._drop(connection)
+
+    def queue_stats(self) -> List[Dict[str, Any]]:
+        """Per-connection queue depth and drop counters, deepest first."""
+        stats = []
+        for websocket, queue in self.outbound.items():
+            user_id, department_id = self.connection_info.get(websocket, (None, None))
+            stats.append({"user_id": user_id, "department_id": department_id, **queue.stats()})
+        return sorted(stats, key=lambda entry: entry["depth"], reverse=True)
+
+    def _channels(self, user_id, department_id) -> List[str]:
+        channels = [f"user:{user_id}"]
+        if department_id is not None:
+            channels.append(f"department:{department_id}")
+        return channels
+
+    def _catch_up(self, channels: List[str], resume: Optional[dict], limit: int) -> List[Frame]:
+        """
+        A hello frame with the current sequence of each channel, then
+        either the frames the client missed or a resync for the channels
+        that cannot be replayed.
+        """
+        frames = [encode_frame({
+            'type': 'hello',
+            'epoch': self.replay.epoch,
+            'channels': {channel: self.replay.last_seq(channel) for channel in channels}
+        })]
+        if not resume:
+            return frames
+
+        last_seen = resume.get('channels') or {}
+        resync = []
+        missed: List[Frame] = []
+        for channel in channels:
+            last_seq = last_seen.get(channel)
+            replay = None
+            if resume.get('epoch') == self.replay.epoch and isinstance(last_seq, int):
+                replay = self.replay.since(channel, last_seq)
+            if replay is None:
+                resync.append(channel)
+            else:
+                missed.extend(replay)
+        # Replaying more than the queue holds would just drop frames again
+        if len(missed) + 2 > limit:
+            resync, missed = channels, []
+        frames.extend(missed)
+        if resync:
+            frames.append(encode_frame({'type': 'resync', 'channels': resync}))
+        return frames
+
+    async def _deliver(self, channel: str, message: dict):
+        """Broker listener: hand a published message to this worker's sockets."""
+        kind, _, key = channel.partition(":")
+        if kind == "user":
+            connections = self.user_connections.get(_connection_key(key))
+        elif kind == "department":
+            connections = self.department_connections.get(_connection_key(key))
+        else:
+            return
+        # Numbered and buffered even with no local sockets, so a client
+        # reconnecting to this worker can still catch up
+        frame = self.replay.record(channel, message)
+        if connections:
+            # Encoded once for every recipient
+            self._fan_out(connections, frame)
+
+    async def send_personal_message(self, message: dict, user_id: int):
+        # Copy rather than stamp the caller's dict, which may be reused
+        message = {**message, 'timestamp': datetime.utcnow().isoformat()}
+        await self.broker.publish(f"user:{user_id}", message)
 
     async def broadcast_to_department(self, message: dict, department_id: int):
-        if department_id in self.department_connections:
-            message['timestamp'] = datetime.utcnow().isoformat()
-            for connection in self.department_connections[department_id]:
-                try:
-                    await connection.send_json(message)
-                except Exception as e:
-                    logger.error(f"Error broadcasting to department {department_id}: {str(e)}")
+        message = {**message, 'timestamp': datetime.utcnow().isoformat()}
+        await self.broker.publish(f"department:{department_id}", message)
 
     async def broadcast_task_update(self, task_data: dict, department_id: int):
         message = {
             'type': 'task_update',
             'data': task_data
         }
-        await self.broadcast_to_department(message, department_id)
+        await self.batcher.add(message, department_id)
 
     async def broadcast_performance_update(self, performance_data: dict, department_id: int):
         message = {
             'type': 'performance_update',
             'data': performance_data
         }
-        await self.broadcast_to_department(message, department_id)
+        await self.batcher.add(message, department_id)
 
     async def broadcast_notification(self, notification: dict, user_id: int):
         message = {
@@ -86,14 +309,14 @@ class WebSocketManager:
             'type': 'skill_update',
             'data': skill_data
         }
-        await self.broadcast_to_department(message, department_id)
+        await self.batcher.add(message, department_id)
 
     async def broadcast_learning_update(self, learning_data: dict, department_id: int):
         message = {
             'type': 'learning_update',
             'data': learning_data
         }
-        await self.broadcast_to_department(message, department_id)
+        await self.batcher.add(message, department_id)
 
 # Create a global instance
-websocket_manager = WebSocketManager() 
\ No newline at end of file
+websocket_manager = WebSocketManager() 
@@ -0,0 +1,103 @@
+from fastapi import WebSocket
+from collections import deque
+from typing import Any, Callable, Deque, Dict, NamedTuple, Optional
+import asyncio
+import logging
+from app.config import settings
+from app.utils.serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+# What to do when a connection's queue is full
+DROP_OLDEST = "drop_oldest"  # discard the oldest pending message
+COALESCE = "coalesce"        # replace the pending message of the same type, else drop oldest
+DISCONNECT = "disconnect"    # give up on the client
+OVERFLOW_POLICIES = (DROP_OLDEST, COALESCE, DISCONNECT)
+
+class Frame(NamedTuple):
+    """A message encoded once, shared by every queue it is sent to."""
+    type: Optional[str]
+    text: str
+
+def encode_frame(message: dict) -> Frame:
+    return Frame(message.get('type'), dumps(message))
+
+class OutboundQueue:
+    """
+    Bounded queue of messages waiting to be sent to one socket, drained
+    by its own writer task. Producers never await the network, so a
+    stalled client only ever costs `maxsize` pending messages.
+    """
+
+    def __init__(self, websocket: WebSocket, on_failure: Callable[[WebSocket], None],
+                 maxsize: Optional[int] = None, policy: Optional[str] = None):
+        self.websocket = websocket
+        self.maxsize = maxsize or settings.WS_QUEUE_SIZE
+        self.policy = policy or settings.WS_OVERFLOW_POLICY
+        if self.policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{self.policy}'. Expected one of: {', '.join(OVERFLOW_POLICIES)}")
+        self._on_failure = on_failure
+        self._messages: Deque[Frame] = deque()
+        self._ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.high_water = 0
+
+    def start(self):
+        self._task = asyncio.create_task(self._writer())
+
+    def stop(self):
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
+        self._task = None
+
+    def put(self, frame: Frame) -> bool:
+        """
+        Queue a frame. Returns False if the queue is full and the policy
+        is to disconnect the client.
+        """
+        if len(self._messages) >= self.maxsize:
+            if self.policy == DISCONNECT:
+                return False
+            if not (self.policy == COALESCE and self._coalesce(frame)):
+                self._messages.popleft()
+                self.dropped += 1
+        self._messages.append(frame)
+        self.high_water = max(self.high_water, len(self._messages))
+        self._ready.set()
+        return True
+
+    def _coalesce(self, frame: Frame) -> bool:
+        # The newer message of a type supersedes the pending one
+        for pending in self._messages:
+            if pending.type == frame.type:
+                self._messages.remove(pending)
+                self.coalesced += 1
+                return True
+        return False
+
+    async def _writer(self):
+        while True:
+            while not self._messages:
+                self._ready.clear()
+                await self._ready.wait()
+            frame = self._messages.popleft()
+            try:
+                await asyncio.wait_for(self.websocket.send_text(frame.text), timeout=settings.WS_SEND_TIMEOUT)
+            except Exception as e:
+                logger.error(f"Error sending WebSocket message: {str(e) or type(e).__name__}")
+                self._on_failure(self.websocket)
+                return
+            self.sent += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "depth": len(self._messages),
+            "high_water": self.high_water,
+            "max_size": self.maxsize,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+        }
@@ -0,0 +1,68 @@
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+import uuid
+from app.config import settings
+from app.utils.websocket_outbound import Frame, encode_frame
+
+class ReplayBuffer:
+    """The most recent frames of one channel, oldest first."""
+
+    def __init__(self, size: int):
+        self.seq = 0
+        self._frames: Deque[Tuple[int, Frame]] = deque(maxlen=size)
+
+    def append(self, frame: Frame):
+        self._frames.append((self.seq, frame))
+
+    def since(self, last_seq: int) -> Optional[List[Frame]]:
+        """
+        Frames after last_seq, or None when some of them have already
+        been evicted (or last_seq is not one this buffer handed out).
+        """
+        if last_seq == self.seq:
+            return []
+        if last_seq > self.seq or not self._frames or self._frames[0][0] > last_seq + 1:
+            return None
+        return [frame for seq, frame in self._frames if seq > last_seq]
+
+class ReplayLog:
+    """
+    Numbers every message delivered on a channel and keeps the last
+    WS_REPLAY_BUFFER_SIZE of them so a reconnecting client can catch up.
+
+    Sequence numbers are per process. The epoch identifies this process's
+    numbering; a client resuming with a different epoch (after a restart,
+    or on another worker) cannot be replayed and must resync.
+    """
+
+    def __init__(self, size: Optional[int] = None):
+        self.size = size or settings.WS_REPLAY_BUFFER_SIZE
+        self.epoch = uuid.uuid4().hex[:12]
+        self._buffers: Dict[str, ReplayBuffer] = {}
+
+    def record(self, channel: str, message: dict) -> Frame:
+        """Assign the next sequence number, encode and remember the message."""
+        buffer = self._buffers.get(channel)
+        if buffer is None:
+            buffer = self._buffers[channel] = ReplayBuffer(self.size)
+        buffer.seq += 1
+        frame = encode_frame({**message, 'channel': channel, 'seq': buffer.seq})
+        buffer.append(frame)
+        return frame
+
+    def last_seq(self, channel: str) -> int:
+        buffer = self._buffers.get(channel)
+        return buffer.seq if buffer is not None else 0
+
+    def since(self, channel: str, last_seq: int) -> Optional[List[Frame]]:
+        buffer = self._buffers.get(channel)
+        if buffer is None:
+            return [] if last_seq == 0 else None
+        return buffer.since(last_seq)
+
+    def stats(self):
+        return {
+            "epoch": self.epoch,
+            "channels": len(self._buffers),
+            "buffered_frames": sum(len(buffer._frames) for buffer in self._buffers.values()),
+        }
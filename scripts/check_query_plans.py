@@ -0,0 +1,66 @@
+"""
+Replay the hot route query shapes against the configured database and
+check that every execution plan reaches its rows through an index.
+
+    python scripts/check_query_plans.py
+
+Uses the same settings as the app (DB_BACKEND=sqlite works offline).
+Exits with status 1 if any query falls back to a full table scan. On
+Oracle, run it against representative data volumes: the optimizer
+legitimately prefers full scans of near-empty tables.
+"""
+from datetime import date
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import func, select
+from app.database import create_schema, dialect, get_engine
+from app.models import AttendanceRecord, Employee, LeaveRequest, Notification, Task
+
+TODAY = date(2026, 1, 1)
+
+# One entry per access path, shaped like the queries the routes issue
+HOT_QUERIES = {
+    "manager.team_overview: team members": select(Employee).where(
+        Employee.department == 1, Employee.employeeID != 1
+    ),
+    "manager.team_overview: tasks per member": select(
+        Task.status, Task.due_date, Task.completed_date
+    ).where(Task.assigned_to == 1),
+    "manager dashboard: open tasks per member": select(func.count()).select_from(Task).where(
+        Task.assigned_to == 1, Task.status != "completed"
+    ),
+    "attendance for an employee and period": select(AttendanceRecord).where(
+        AttendanceRecord.employeeID == 1, AttendanceRecord.att_date >= TODAY
+    ),
+    "unread notifications": select(Notification).where(
+        Notification.employeeID == 1, Notification.read_flag == "N"
+    ),
+    "overlapping leave requests": select(LeaveRequest).where(
+        LeaveRequest.employeeID == 1,
+        LeaveRequest.start_date <= TODAY,
+        LeaveRequest.end_date >= TODAY
+    ),
+}
+
+def main() -> int:
+    engine = get_engine()
+    create_schema()
+    failures = 0
+    with engine.connect() as connection:
+        for name, statement in HOT_QUERIES.items():
+            sql = str(statement.compile(engine, compile_kwargs={"literal_binds": True}))
+            plan = dialect.explain(connection, sql)
+            full_scans = [step for step in plan if dialect.is_full_scan(step)]
+            status = "FULL SCAN" if full_scans else "ok"
+            print(f"[{status}] {name}")
+            for step in plan:
+                print(f"    {step}")
+            failures += bool(full_scans)
+    print(f"{len(HOT_QUERIES) - failures}/{len(HOT_QUERIES)} queries use an index")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+/*
+ * Reconnecting WebSocket client for /ws/{user_id}.
+ *
+ * The server numbers every message per channel ("user:<id>",
+ * "department:<id>"). On reconnect the last sequence seen on each channel
+ * is sent back so only the missed messages are replayed; when they are
+ * no longer buffered the server sends {"type": "resync"} and onResync
+ * should reload the page's data. A gap in a channel's sequence (a frame
+ * dropped for a slow consumer) is handled the same way: the socket is
+ * reopened with the last contiguous sequence so the server replays the
+ * gap or asks for a resync. Server pings are answered with a pong so the
+ * connection is not reaped as idle.
+ */
+class LiveSocket {
+    constructor(path, { onMessage = () => {}, onResync = () => {} } = {}) {
+        this.path = path;
+        this.onMessage = onMessage;
+        this.onResync = onResync;
+        this.epoch = null;
+        this.lastSeq = {};
+        this.hello = {};
+        this.retryDelay = 1000;
+        this.connect();
+    }
+
+    url() {
+        const scheme = window.location.protocol === 'https:' ? 'wss' : 'ws';
+        let url = `${scheme}://${window.location.host}${this.path}`;
+        if (this.epoch) {
+            const resume = JSON.stringify({ epoch: this.epoch, channels: this.lastSeq });
+            url += `?resume=${encodeURIComponent(resume)}`;
+        }
+        return url;
+    }
+
+    connect() {
+        this.ws = new WebSocket(this.url());
+        this.ws.onopen = () => { this.retryDelay = 1000; };
+        this.ws.onmessage = (event) => this.receive(JSON.parse(event.data));
+        this.ws.onclose = () => {
+            setTimeout(() => this.connect(), this.retryDelay);
+            this.retryDelay = Math.min(this.retryDelay * 2, 30000);
+        };
+    }
+
+    send(message) {
+        if (this.ws.readyState === WebSocket.OPEN) {
+            this.ws.send(JSON.stringify(message));
+        }
+    }
+
+    receive(data) {
+        if (data.type === 'ping') {
+            this.send({ type: 'pong' });
+            return;
+        }
+        if (data.type === 'hello') {
+            const restarted = this.epoch !== data.epoch;
+            this.epoch = data.epoch;
+            this.hello = data.channels;
+            for (const [channel, seq] of Object.entries(data.channels)) {
+                if (restarted || !(channel in this.lastSeq)) {
+                    this.lastSeq[channel] = seq;
+                }
+            }
+            return;
+        }
+        if (data.type === 'resync') {
+            data.channels.forEach(channel => { this.lastSeq[channel] = this.hello[channel] || 0; });
+            this.onResync(data.channels);
+            return;
+        }
+        if (data.channel) {
+            const last = this.lastSeq[data.channel];
+            if (last !== undefined && data.seq <= last) {
+                return;  // Already delivered, e.g. replayed after a reconnect
+            }
+            if (last !== undefined && data.seq !== last + 1) {
+                // Drop whatever is still queued; onclose reconnects
+                this.ws.onmessage = null;
+                this.ws.close();
+                return;
+            }
+            this.lastSeq[data.channel] = data.seq;
+        }
+        this.onMessage(data);
+    }
+}